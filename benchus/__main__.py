@@ -0,0 +1,172 @@
+import argparse
+import json
+import logging
+import sys
+
+from .comparus import (
+    BASELINE_PATH,
+    DEFAULT_ALPHA,
+    DEFAULT_THRESHOLD,
+    compare_runs,
+    environment_differences,
+    format_comparison,
+    has_regression,
+    load_run,
+    record_run,
+    save_run,
+)
+from .suitus import format_result, run_benchmark
+from .synthus import GuildConfig, generate_guild
+from .workloadus import WORKLOADS
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchus", description="Dashboard benchmark suite"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser(
+        "generate", help="Write a synthetic guild cache and server_data.json"
+    )
+    generate.add_argument("output", help="Directory receiving the synthetic dataset")
+    generate.add_argument(
+        "--messages",
+        type=int,
+        default=None,
+        help="Total number of messages (defaults to rate x days)",
+    )
+    generate.add_argument("--users", type=int, default=300)
+    generate.add_argument("--channels", type=int, default=40)
+    generate.add_argument("--years", type=float, default=6.0)
+    generate.add_argument(
+        "--rate", type=float, default=1_000.0, help="Average messages per day"
+    )
+    generate.add_argument(
+        "--mudae-share",
+        type=float,
+        default=0.15,
+        help="Share of messages posted in mudae channels",
+    )
+    generate.add_argument(
+        "--mention-rate",
+        type=float,
+        default=0.06,
+        help="Share of messages mentioning at least one member",
+    )
+    generate.add_argument(
+        "--reaction-rate",
+        type=float,
+        default=0.12,
+        help="Share of messages with at least one reaction",
+    )
+    generate.add_argument(
+        "--reaction-tail",
+        type=float,
+        default=2.2,
+        help="Pareto exponent of reaction counts (lower means more viral messages)",
+    )
+    generate.add_argument(
+        "--activity-skew",
+        type=float,
+        default=1.0,
+        help="Zipf exponent of message counts per member",
+    )
+    generate.add_argument("--seed", type=int, default=0)
+
+    run = commands.add_parser("run", help="Time the dashboard on a dataset")
+    run.add_argument("data", help="Directory holding the cache and server_data.json")
+    run.add_argument("--label", type=str, default="run")
+    run.add_argument(
+        "--repeat", type=int, default=3, help="Rounds of dashboard updates to time"
+    )
+    run.add_argument("--results-dir", type=str, default=None)
+    run.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Also record Python allocation peaks per stage (slower)",
+    )
+
+    baseline = commands.add_parser(
+        "baseline", help="Record the standard workloads as a baseline file"
+    )
+    compare = commands.add_parser(
+        "compare", help="Run the standard workloads and compare them to a baseline"
+    )
+    for command in (baseline, compare):
+        command.add_argument(
+            "data", help="Directory holding the cache and server_data.json"
+        )
+        command.add_argument(
+            "--samples", type=int, default=7, help="Timed repetitions per workload"
+        )
+        command.add_argument(
+            "--workloads",
+            type=str,
+            default=",".join(WORKLOADS),
+            help=f"Comma-separated subset of {', '.join(WORKLOADS)}",
+        )
+    baseline.add_argument("--output", type=str, default=BASELINE_PATH)
+    compare.add_argument("--baseline", type=str, default=BASELINE_PATH)
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Relative slowdown of the median tolerated before failing",
+    )
+    compare.add_argument(
+        "--alpha",
+        type=float,
+        default=DEFAULT_ALPHA,
+        help="Significance level of the Mann-Whitney test",
+    )
+    compare.add_argument(
+        "--save", type=str, default=None, help="Also write the new run to this file"
+    )
+
+    args = parser.parse_args()
+    if args.command in ("baseline", "compare"):
+        workloads = [name.strip() for name in args.workloads.split(",")]
+        run = record_run(args.data, args.samples, workloads)
+        if args.command == "baseline":
+            save_run(run, args.output)
+            logging.info(f"Baseline saved to {args.output}")
+            return
+
+        if args.save:
+            save_run(run, args.save)
+        reference = load_run(args.baseline)
+        rows = compare_runs(reference, run, args.threshold, args.alpha)
+        print(format_comparison(rows, environment_differences(reference, run)))
+        if has_regression(rows):
+            sys.exit(1)
+        return
+
+    if args.command == "generate":
+        config = GuildConfig(
+            messages=args.messages,
+            users=args.users,
+            channels=args.channels,
+            years=args.years,
+            rate=args.rate,
+            mudae_share=args.mudae_share,
+            mention_rate=args.mention_rate,
+            reaction_rate=args.reaction_rate,
+            reaction_tail=args.reaction_tail,
+            activity_skew=args.activity_skew,
+            seed=args.seed,
+        )
+        generate_guild(config, args.output)
+        return
+
+    options = {"results_dir": args.results_dir} if args.results_dir else {}
+    path = run_benchmark(
+        args.data, args.repeat, args.label, trace_memory=args.trace_memory, **options
+    )
+    with open(path, encoding="utf-8") as f:
+        print(format_result(json.load(f)))
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.INFO)
+    main()
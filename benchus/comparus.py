@@ -0,0 +1,151 @@
+import json
+import math
+import os
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .suitus import environment
+from .workloadus import run_workloads, workload_group
+
+BASELINE_PATH = os.path.join("bench_results", "baseline.json")
+DEFAULT_THRESHOLD = 0.10
+DEFAULT_ALPHA = 0.05
+# Écarts d'environnement qui rendent la comparaison peu fiable
+ENVIRONMENT_KEYS = [
+    "python",
+    "platform",
+    "cpus",
+    "pandas",
+    "numpy",
+    "pyarrow",
+    "dash",
+]
+
+
+def mann_whitney_greater(sample: list, reference: list) -> float:
+    x, y = np.asarray(sample, dtype=float), np.asarray(reference, dtype=float)
+    n1, n2 = len(x), len(y)
+    if not n1 or not n2:
+        return 1.0
+
+    ranks = pd.Series(np.concatenate([x, y])).rank().to_numpy()
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    _, tie_counts = np.unique(np.concatenate([x, y]), return_counts=True)
+    n = n1 + n2
+    variance = (
+        n1 * n2 / 12 * ((n + 1) - (tie_counts**3 - tie_counts).sum() / (n * (n - 1)))
+    )
+    if variance <= 0:
+        return 1.0
+    # Approximation normale avec correction de continuité, unilatérale
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def record_run(data_dir: str, samples: int, workloads: list) -> dict:
+    config = None
+    config_path = os.path.join(data_dir, "config.json")
+    if os.path.exists(config_path):
+        with open(config_path, encoding="utf-8") as f:
+            config = json.load(f)
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "dataset": {"path": data_dir, "config": config},
+        "samples": samples,
+        "requested": workloads,
+        "workloads": run_workloads(data_dir, samples, workloads),
+    }
+
+
+def save_run(run: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+
+
+def load_run(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def environment_differences(baseline: dict, current: dict) -> list:
+    return [
+        f"{key}: {baseline['environment'].get(key)} "
+        f"-> {current['environment'].get(key)}"
+        for key in ENVIRONMENT_KEYS
+        if baseline["environment"].get(key) != current["environment"].get(key)
+    ]
+
+
+def compare_runs(
+    baseline: dict,
+    current: dict,
+    threshold: float = DEFAULT_THRESHOLD,
+    alpha: float = DEFAULT_ALPHA,
+) -> list:
+    rows = []
+    requested = current.get("requested")
+    names = [
+        name
+        for name in baseline["workloads"]
+        if requested is None or workload_group(name) in requested
+    ] + [name for name in current["workloads"] if name not in baseline["workloads"]]
+    for name in names:
+        before = baseline["workloads"].get(name)
+        after = current["workloads"].get(name)
+        if before is None or after is None:
+            rows.append(
+                {"name": name, "status": "new" if before is None else "missing"}
+            )
+            continue
+
+        before_ms = float(np.median(before) * 1000)
+        after_ms = float(np.median(after) * 1000)
+        change = after_ms / before_ms - 1 if before_ms else 0.0
+        slower_p = mann_whitney_greater(after, before)
+        faster_p = mann_whitney_greater(before, after)
+
+        # Il faut à la fois un écart au-delà du seuil et un écart significatif
+        status = "ok"
+        if change > threshold and slower_p < alpha:
+            status = "regression"
+        elif change < -threshold and faster_p < alpha:
+            status = "improvement"
+        rows.append(
+            {
+                "name": name,
+                "baseline_ms": round(before_ms, 2),
+                "current_ms": round(after_ms, 2),
+                "change": round(change, 4),
+                "p_value": round(slower_p if change >= 0 else faster_p, 4),
+                "status": status,
+            }
+        )
+    return rows
+
+
+def has_regression(rows: list) -> bool:
+    return any(row["status"] == "regression" for row in rows)
+
+
+def format_comparison(rows: list, notes: Optional[list] = None) -> str:
+    lines = [
+        f"{'workload':<28}{'baseline ms':>13}{'current ms':>12}"
+        f"{'change':>9}{'p':>8}  status"
+    ]
+    for row in rows:
+        if "change" not in row:
+            lines.append(f"{row['name']:<28}{'':>42}  {row['status']}")
+            continue
+        lines.append(
+            f"{row['name']:<28}{row['baseline_ms']:>13.1f}"
+            f"{row['current_ms']:>12.1f}{row['change']:>+9.1%}"
+            f"{row['p_value']:>8.3f}  {row['status']}"
+        )
+    for note in notes or []:
+        lines.append(f"! environment changed, {note}")
+    return "\n".join(lines)
@@ -0,0 +1,337 @@
+import contextlib
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from corus.parquetus import read_message_cache
+from corus.preparus import prepare_dataframe
+from dashboardus.appus import create_app
+from dashboardus.metricus import metrics
+from dashboardus.storus import TEXT_COLUMNS, MessageTextStore, drop_text_columns
+from dataus.constant import (
+    CACHE_FILENAME,
+    MESSAGE_TEXT_FILENAME,
+    MUDAE_CHANNELS,
+    SERVER_DATA_FILENAME,
+)
+
+RESULTS_DIR = "bench_results"
+UPDATE_OUTPUT = "evolution-graph.figure"
+PROFILE_OUTPUT = "user-profile-card-container.children"
+# Chaque scénario force un autre groupe de builders
+UPDATE_SCENARIOS = [
+    {"name": "default", "days": 365, "props": {}},
+    {
+        "name": "monthly_characters",
+        "days": 365,
+        "props": {
+            ("evolution-graph-selector", "value"): 1,
+            ("metric-selector", "value"): "characters",
+        },
+    },
+    {
+        "name": "virgule_weekday",
+        "days": 180,
+        "props": {
+            ("virgule-filter", "value"): "virgule_only",
+            ("distribution-time-unit", "value"): "weekday",
+        },
+    },
+    {
+        "name": "mudae_heatmap",
+        "days": 90,
+        "props": {
+            ("mudae-filter-switch", "value"): True,
+            ("distribution-time-unit", "value"): "weekday_hour",
+        },
+    },
+    {
+        "name": "all_time_years",
+        "days": None,
+        "props": {("distribution-time-unit", "value"): "year"},
+    },
+]
+RESET_PROPS = {
+    ("evolution-graph-selector", "value"): 0,
+    ("metric-selector", "value"): "messages",
+    ("virgule-filter", "value"): "everyone",
+    ("distribution-time-unit", "value"): "hour",
+    ("mudae-filter-switch", "value"): False,
+    ("top-n-dropdown", "value"): 10,
+}
+
+
+def current_rss_mb() -> Optional[float]:
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return None
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> dict:
+    import dash
+    import pyarrow
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "pyarrow": pyarrow.__version__,
+        "dash": dash.__version__,
+        "commit": git_commit(),
+    }
+
+
+def read_cache(cache_path: str) -> pd.DataFrame:
+    return read_message_cache(cache_path, exclude=TEXT_COLUMNS)
+
+
+def summarize_durations(seconds: list) -> dict:
+    values = np.array(seconds) * 1000
+    return {
+        "count": len(values),
+        "mean_ms": round(float(values.mean()), 2),
+        "p50_ms": round(float(np.percentile(values, 50)), 2),
+        "p95_ms": round(float(np.percentile(values, 95)), 2),
+        "max_ms": round(float(values.max()), 2),
+    }
+
+
+class DashClient:
+    def __init__(self, app) -> None:
+        self.client = app.server.test_client()
+        self.props: dict = {}
+        self._collect(self.client.get("/_dash-layout").get_json())
+        self.dependencies = self.client.get("/_dash-dependencies").get_json()
+
+    def _collect(self, node) -> None:
+        if isinstance(node, list):
+            for child in node:
+                self._collect(child)
+        elif isinstance(node, dict):
+            props = node.get("props")
+            if isinstance(props, dict):
+                if isinstance(props.get("id"), str):
+                    for prop, value in props.items():
+                        self.props[(props["id"], prop)] = value
+                for value in props.values():
+                    self._collect(value)
+
+    def dependency(self, output: str) -> dict:
+        for dependency in self.dependencies:
+            outputs = dependency["output"].strip(".").split("...")
+            if output in outputs:
+                return dependency
+        raise KeyError(f"No callback outputs {output}.")
+
+    def fire(self, output: str, changed: dict) -> tuple[float, int]:
+        dependency = self.dependency(output)
+        self.props.update(changed)
+
+        def spec(item: dict) -> dict:
+            return {
+                "id": item["id"],
+                "property": item["property"],
+                "value": self.props.get((item["id"], item["property"])),
+            }
+
+        outputs = [
+            dict(zip(("id", "property"), name.rsplit(".", 1)))
+            for name in dependency["output"].strip(".").split("...")
+        ]
+        payload = {
+            "output": dependency["output"],
+            "outputs": outputs if len(outputs) > 1 else outputs[0],
+            "inputs": [spec(item) for item in dependency["inputs"]],
+            "state": [spec(item) for item in dependency["state"]],
+            "changedPropIds": [f"{id}.{prop}" for id, prop in changed],
+        }
+
+        start = time.perf_counter()
+        response = self.client.post("/_dash-update-component", json=payload)
+        seconds = time.perf_counter() - start
+        if response.status_code not in (200, 204):
+            raise RuntimeError(
+                f"Callback {output} failed with {response.status_code}."
+            )
+        if response.status_code == 200:
+            for component, values in response.get_json()["response"].items():
+                for prop, value in values.items():
+                    self.props[(component, prop)] = value
+        return seconds, len(response.data)
+
+
+class BenchmarkRun:
+    def __init__(self, label: str, trace_memory: bool = False) -> None:
+        self.label = label
+        self.trace_memory = trace_memory
+        self.stages: dict = {}
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            result = {
+                "seconds": round(seconds, 3),
+                "rss_mb": current_rss_mb(),
+                "peak_rss_mb": peak_rss_mb(),
+            }
+            if self.trace_memory:
+                result["traced_peak_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+                tracemalloc.stop()
+            self.stages[name] = result
+            logging.info(
+                f"[bench] {name}: {seconds:.2f}s, "
+                f"peak RSS {result['peak_rss_mb']:.0f} MB"
+            )
+
+
+def run_benchmark(
+    data_dir: str,
+    repeat: int = 3,
+    label: str = "run",
+    results_dir: str = RESULTS_DIR,
+    trace_memory: bool = False,
+) -> str:
+    run = BenchmarkRun(label, trace_memory)
+    cache_path = os.path.join(data_dir, CACHE_FILENAME)
+    with open(os.path.join(data_dir, SERVER_DATA_FILENAME), encoding="utf-8") as f:
+        server_data = json.load(f)
+
+    with run.stage("read_cache"):
+        cache_df = read_cache(cache_path)
+    messages = len(cache_df)
+
+    with run.stage("prepare_dataframe"):
+        df = drop_text_columns(prepare_dataframe(cache_df, server_data))
+    del cache_df
+
+    text_path = os.path.join(data_dir, MESSAGE_TEXT_FILENAME)
+    text_store = MessageTextStore(text_path) if os.path.exists(text_path) else None
+    with run.stage("create_app"):
+        app = create_app(df, server_data, MUDAE_CHANNELS, text_store=text_store)
+    data_end = df["timestamp"].iloc[-1].date()
+    data_start = df["timestamp"].iloc[0].date()
+    del df
+
+    client = DashClient(app)
+    with run.stage("first_update"):
+        client.fire(UPDATE_OUTPUT, {})
+
+    update_seconds: dict = {scenario["name"]: [] for scenario in UPDATE_SCENARIOS}
+    update_bytes: list = []
+    with run.stage("updates"):
+        for r in range(repeat):
+            # Fenêtre décalée d'un jour à chaque tour : aucun résultat en cache ne sert
+            end = data_end - timedelta(days=r)
+            for scenario in UPDATE_SCENARIOS:
+                start = (
+                    data_start
+                    if scenario["days"] is None
+                    else end - timedelta(days=scenario["days"])
+                )
+                changed = {
+                    ("date-picker-range", "start_date"): start.isoformat(),
+                    ("date-picker-range", "end_date"): end.isoformat(),
+                    **RESET_PROPS,
+                    **scenario["props"],
+                }
+                seconds, nbytes = client.fire(UPDATE_OUTPUT, changed)
+                update_seconds[scenario["name"]].append(seconds)
+                update_bytes.append(nbytes)
+
+                users = client.props.get(("user-dropdown", "value")) or [None]
+                client.fire(
+                    PROFILE_OUTPUT, {("highlight-user-dropdown", "value"): users[0]}
+                )
+
+    snapshot = metrics.snapshot()
+    result = {
+        "label": label,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "dataset": {"path": data_dir, "messages": messages},
+        "config": None,
+        "repeat": repeat,
+        "stages": run.stages,
+        "updates": {
+            name: summarize_durations(seconds)
+            for name, seconds in update_seconds.items()
+        },
+        "update_payload_bytes": int(np.mean(update_bytes)),
+        "builders": snapshot.get("builders", {}),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    config_path = os.path.join(data_dir, "config.json")
+    if os.path.exists(config_path):
+        with open(config_path, encoding="utf-8") as f:
+            result["config"] = json.load(f)
+
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(
+        results_dir, f"{datetime.now():%Y%m%d-%H%M%S}-{label}.json"
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+    logging.info(f"Benchmark results saved to {path}")
+    return path
+
+
+def format_result(result: dict) -> str:
+    lines = [
+        f"{result['label']} - {result['dataset']['messages']} messages, "
+        f"commit {result['environment'].get('commit')}",
+        "",
+        f"{'stage':<24}{'seconds':>10}{'peak RSS MB':>14}",
+    ]
+    for name, stage in result["stages"].items():
+        lines.append(
+            f"{name:<24}{stage['seconds']:>10.2f}{stage['peak_rss_mb']:>14.0f}"
+        )
+    lines += ["", f"{'update scenario':<24}{'p50 ms':>10}{'p95 ms':>10}"]
+    for name, stats in result["updates"].items():
+        lines.append(f"{name:<24}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}")
+    lines += ["", f"{'builder':<32}{'count':>7}{'mean ms':>10}{'max ms':>10}"]
+    for name, stats in sorted(
+        result["builders"].items(), key=lambda item: -item[1]["total_ms"]
+    ):
+        lines.append(
+            f"{name:<32}{stats['count']:>7}"
+            f"{stats['mean_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,294 @@
+import json
+import logging
+import os
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from corus.botus import get_len_content
+from corus.parquetus import write_cache_table
+from dashboardus.storus import TEXT_COLUMNS, write_text_table
+from dataus.constant import (
+    CACHE_FILENAME,
+    DISCORD_EPOCH_MS,
+    MESSAGE_TEXT_FILENAME,
+    MUDAE_CHANNELS,
+    SERVER_DATA_FILENAME,
+)
+
+GUILD_ID = 443099866953154048
+VIRGULE_ROLE_NAME = "Virgule du 4'"
+CHUNK_SIZE = 1_000_000
+CONTENT_POOL_SIZE = 20_000
+WORDS = [
+    "salut", "ça", "va", "quoi", "lol", "mdr", "demain", "ce", "soir", "on",
+    "joue", "ou", "pas", "trop", "bien", "jsp", "wesh", "grave", "le", "la",
+    "match", "film", "manger", "pizza", "sérieux", "non", "oui", "genre",
+    "vraiment", "incroyable", "bof", "attends", "voilà", "merci", "bonne",
+    "nuit", "après", "déjà", "encore", "toujours",
+]
+EMOJIS = [
+    "😂", "👍", "❤️", "🔥", "😭", "💀", "👀",
+    "<:pepe:1012345678901234567>",
+]
+ROLE_COLORS = ["#99aab5", "#e91e63", "#3498db", "#2ecc71", "#f1c40f", "#9b59b6"]
+# Profil horaire d'un serveur français : creux la nuit, pic en soirée
+HOUR_WEIGHTS = np.array(
+    [4, 2, 1, 1, 1, 1, 2, 4, 6, 7, 8, 9, 10, 9, 9, 9, 10, 11, 12, 13, 14, 13, 10, 7],
+    dtype=float,
+)
+
+
+class GuildConfig:
+    def __init__(
+        self,
+        messages: Optional[int] = None,
+        users: int = 300,
+        channels: int = 40,
+        years: float = 6.0,
+        rate: float = 1_000.0,
+        mudae_share: float = 0.15,
+        mention_rate: float = 0.06,
+        role_mention_rate: float = 0.005,
+        reaction_rate: float = 0.12,
+        reaction_tail: float = 2.2,
+        activity_skew: float = 1.0,
+        seed: int = 0,
+        end: str = "2026-10-01",
+    ) -> None:
+        self.users = users
+        self.channels = channels
+        self.years = years
+        self.rate = rate
+        self.messages = (
+            messages if messages is not None else int(rate * 365.25 * years)
+        )
+        self.mudae_share = mudae_share
+        self.mention_rate = mention_rate
+        self.role_mention_rate = role_mention_rate
+        self.reaction_rate = reaction_rate
+        self.reaction_tail = reaction_tail
+        self.activity_skew = activity_skew
+        self.seed = seed
+        self.end = end
+
+    def to_dict(self) -> dict:
+        return dict(vars(self))
+
+
+class SyntheticGuild:
+    def __init__(self, config: GuildConfig) -> None:
+        self.config = config
+        rng = np.random.default_rng(config.seed)
+        self.end_ms = pd.Timestamp(config.end, tz="UTC").value // 1_000_000
+        self.start_ms = self.end_ms - int(config.years * 365.25 * 86_400_000)
+
+        self.user_ids = self._snowflakes(rng, config.users, self.start_ms)
+        self.role_ids = self._snowflakes(rng, 12, self.start_ms)
+        self.channel_ids = np.concatenate(
+            [
+                self._snowflakes(
+                    rng, max(config.channels - len(MUDAE_CHANNELS), 1), self.start_ms
+                ),
+                np.array(MUDAE_CHANNELS, dtype="int64"),
+            ]
+        )
+
+        # Activité très inégale entre membres, chacun actif sur une période à lui
+        ranks = rng.permutation(np.arange(1, config.users + 1))
+        self.user_weights = 1.0 / ranks**config.activity_skew
+        self.user_weights /= self.user_weights.sum()
+        span_ms = self.end_ms - self.start_ms
+        self.user_starts = self.start_ms + (
+            rng.beta(1.2, 3.0, config.users) * span_ms
+        ).astype("int64")
+        self.user_ends = np.minimum(
+            self.user_starts
+            + (rng.uniform(0.2, 1.5, config.users) * span_ms).astype("int64"),
+            self.end_ms,
+        )
+
+        regular = len(self.channel_ids) - len(MUDAE_CHANNELS)
+        channel_weights = 1.0 / np.arange(1, regular + 1)
+        channel_weights *= (1 - config.mudae_share) / channel_weights.sum()
+        self.channel_weights = np.concatenate(
+            [
+                channel_weights,
+                np.full(
+                    len(MUDAE_CHANNELS), config.mudae_share / len(MUDAE_CHANNELS)
+                ),
+            ]
+        )
+
+        pool_rng = np.random.default_rng(config.seed + 1)
+        self.content_pool = np.array(
+            [self._sentence(pool_rng) for _ in range(CONTENT_POOL_SIZE)],
+            dtype=object,
+        )
+        self.content_lengths = np.array(
+            [get_len_content(text) for text in self.content_pool], dtype="int64"
+        )
+
+    @staticmethod
+    def _snowflakes(
+        rng: np.random.Generator, count: int, before_ms: int
+    ) -> np.ndarray:
+        created = rng.integers(DISCORD_EPOCH_MS, before_ms, count)
+        return ((created - DISCORD_EPOCH_MS) << 22) + rng.integers(0, 1 << 22, count)
+
+    def _sentence(self, rng: np.random.Generator) -> str:
+        words = list(rng.choice(WORDS, int(rng.geometric(0.18))))
+        roll = rng.random()
+        if roll < 0.04:
+            words.append(f"https://example.com/{rng.integers(1_000_000)}")
+        elif roll < 0.08:
+            words.insert(0, f"<@{rng.choice(self.user_ids)}>")
+        elif roll < 0.1:
+            words.append(str(rng.choice(EMOJIS)))
+        elif roll < 0.14:
+            return ""
+        return " ".join(words)
+
+    def server_data(self) -> dict:
+        rng = np.random.default_rng(self.config.seed + 2)
+        roles = {
+            str(role_id): {
+                "name": VIRGULE_ROLE_NAME if i == 0 else f"Role {i}",
+                "color": ROLE_COLORS[i % len(ROLE_COLORS)],
+            }
+            for i, role_id in enumerate(self.role_ids)
+        }
+        channels = {
+            str(channel_id): {"name": f"salon-{i}"}
+            for i, channel_id in enumerate(self.channel_ids)
+        }
+        members = {}
+        for i, user_id in enumerate(self.user_ids):
+            user_roles = [
+                int(role_id)
+                for j, role_id in enumerate(self.role_ids)
+                if rng.random() < (0.6 if j == 0 else 0.15)
+            ]
+            members[str(user_id)] = {
+                "name": f"Membre {i:05d}",
+                "original_name": f"membre_{i:05d}",
+                "roles": user_roles,
+                "top_role_color": ROLE_COLORS[i % len(ROLE_COLORS)],
+            }
+        return {"roles": roles, "channels": channels, "members": members}
+
+    def _ids_lists(
+        self,
+        rng: np.random.Generator,
+        n: int,
+        rate: float,
+        ids: np.ndarray,
+        skew: float,
+    ) -> pa.Array:
+        counts = np.where(rng.random(n) < rate, rng.geometric(0.7, n), 0)
+        offsets = np.concatenate([[0], np.cumsum(counts)]).astype("int32")
+        weights = 1.0 / np.arange(1, len(ids) + 1) ** skew
+        values = rng.choice(ids, int(offsets[-1]), p=weights / weights.sum())
+        return pa.ListArray.from_arrays(offsets, pa.array(values, type=pa.int64()))
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[pa.Table]:
+        config = self.config
+        for chunk_start in range(0, config.messages, chunk_size):
+            n = min(chunk_size, config.messages - chunk_start)
+            rng = np.random.default_rng([config.seed, chunk_start])
+
+            authors = rng.choice(len(self.user_ids), n, p=self.user_weights)
+            days = rng.integers(
+                self.user_starts[authors] // 86_400_000,
+                self.user_ends[authors] // 86_400_000 + 1,
+            )
+            hours = rng.choice(24, n, p=HOUR_WEIGHTS / HOUR_WEIGHTS.sum())
+            created_ms = np.clip(
+                days * 86_400_000
+                + hours * 3_600_000
+                + rng.integers(0, 3_600_000, n),
+                self.start_ms,
+                self.end_ms,
+            )
+            sequence = chunk_start + np.arange(n)
+            message_ids = ((created_ms - DISCORD_EPOCH_MS) << 22) + (
+                sequence & 0x3FFFFF
+            )
+            channel_ids = rng.choice(self.channel_ids, n, p=self.channel_weights)
+
+            content_codes = rng.integers(0, CONTENT_POOL_SIZE, n)
+            reacted = rng.random(n) < config.reaction_rate
+            reaction_counts = np.where(
+                reacted, np.floor(rng.pareto(config.reaction_tail, n) + 1), 0
+            ).astype("int64")
+            emojis = np.array(EMOJIS, dtype=object)[rng.integers(0, len(EMOJIS), n)]
+            emojis[~reacted] = None
+            edited = rng.random(n) < 0.05
+            edited_ms = created_ms + rng.integers(1_000, 3_600_000, n)
+            jump_urls = (
+                f"https://discord.com/channels/{GUILD_ID}/"
+                + pd.Series(channel_ids).astype(str)
+                + "/"
+                + pd.Series(message_ids).astype(str)
+            )
+
+            yield pa.table(
+                {
+                    "message_id": pa.array(message_ids, type=pa.int64()),
+                    "author_id": pa.array(self.user_ids[authors], type=pa.int64()),
+                    "author_discord_name": pa.array(
+                        np.char.add("membre_", authors.astype(str)), type=pa.string()
+                    ),
+                    "channel_id": pa.array(channel_ids, type=pa.int64()),
+                    "content": pa.array(
+                        self.content_pool[content_codes], type=pa.string()
+                    ),
+                    "len_content": pa.array(self.content_lengths[content_codes]),
+                    "edited_at": pa.array(edited_ms, type=pa.int64(), mask=~edited),
+                    "attachments": pa.array((rng.random(n) < 0.04).astype("int64")),
+                    "embeds": pa.array((rng.random(n) < 0.03).astype("int64")),
+                    "mentions": self._ids_lists(
+                        rng, n, config.mention_rate, self.user_ids, 1.1
+                    ),
+                    "mentioned_role_ids": self._ids_lists(
+                        rng, n, config.role_mention_rate, self.role_ids, 1.0
+                    ),
+                    "top_reaction_emoji": pa.array(emojis, type=pa.string()),
+                    "top_reaction_count": pa.array(reaction_counts),
+                    "pinned": pa.array(rng.random(n) < 0.0005),
+                    "jump_url": pa.array(jump_urls, type=pa.string()),
+                }
+            )
+
+
+def generate_guild(config: GuildConfig, output_dir: str) -> str:
+    os.makedirs(output_dir, exist_ok=True)
+    guild = SyntheticGuild(config)
+
+    with open(
+        os.path.join(output_dir, SERVER_DATA_FILENAME), "w", encoding="utf-8"
+    ) as f:
+        json.dump(guild.server_data(), f, ensure_ascii=False, indent=2)
+
+    cache_path = os.path.join(output_dir, CACHE_FILENAME)
+    tables = []
+    written = 0
+    for table in guild.chunks():
+        tables.append(table)
+        written += table.num_rows
+        logging.info(f"Generated {written}/{config.messages} messages.")
+    if tables:
+        # Le cache est réécrit trié par salon, comme le fait le bot
+        table = pa.concat_tables(tables)
+        del tables
+        write_cache_table(table, cache_path)
+        write_text_table(
+            table.select(["message_id"] + TEXT_COLUMNS),
+            os.path.join(output_dir, MESSAGE_TEXT_FILENAME),
+        )
+
+    with open(os.path.join(output_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump(config.to_dict(), f, indent=2)
+    return cache_path
@@ -0,0 +1,213 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+from types import SimpleNamespace
+from typing import Callable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from corus.botus import create_message_data, get_len_content
+from corus.parquetus import (
+    append_cache_part,
+    compact_message_cache,
+    write_message_cache,
+)
+from corus.preparus import prepare_dataframe
+from corus.snowflakus import compact_timestamps
+from dashboardus.appus import create_app
+from dashboardus.storus import MessageTextStore, drop_text_columns
+from dataus.constant import (
+    CACHE_FILENAME,
+    MESSAGE_TEXT_FILENAME,
+    MUDAE_CHANNELS,
+    SERVER_DATA_FILENAME,
+)
+
+from .suitus import (
+    PROFILE_OUTPUT,
+    RESET_PROPS,
+    UPDATE_OUTPUT,
+    UPDATE_SCENARIOS,
+    DashClient,
+    read_cache,
+)
+
+INGESTION_MESSAGES = 50_000
+LEN_CONTENT_MESSAGES = 100_000
+WORKLOADS = ["ingestion", "len_content", "prepare", "callbacks"]
+
+
+def workload_group(name: str) -> str:
+    return "callbacks" if name.startswith("callback:") else name
+
+
+def timed_samples(
+    samples: int,
+    func: Callable[[], object],
+    setup: Optional[Callable[[], object]] = None,
+) -> list:
+    # Un premier passage non compté remplit les caches de regex et d'allocateur
+    if setup is not None:
+        setup()
+    func()
+    seconds = []
+    for _ in range(samples):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - start)
+    return seconds
+
+
+def sample_rows(cache_path: str, count: int) -> pd.DataFrame:
+    # Groupe par groupe, jusqu'à avoir assez de lignes
+    parquet_file = pq.ParquetFile(cache_path)
+    tables = []
+    rows = 0
+    for index in range(parquet_file.num_row_groups):
+        if rows >= count:
+            break
+        tables.append(parquet_file.read_row_group(index))
+        rows += tables[-1].num_rows
+    if not tables:
+        tables.append(parquet_file.schema_arrow.empty_table())
+    table = pa.concat_tables(tables).slice(0, count)
+    return compact_timestamps(table.to_pandas())
+
+
+def fake_message(row) -> SimpleNamespace:
+    # Seuls les attributs lus par create_message_data sont reproduits
+    reactions = (
+        [SimpleNamespace(emoji=row.top_reaction_emoji, count=row.top_reaction_count)]
+        if row.top_reaction_count
+        else []
+    )
+    return SimpleNamespace(
+        id=row.message_id,
+        author=SimpleNamespace(id=row.author_id, name=row.author_discord_name),
+        channel=SimpleNamespace(id=row.channel_id),
+        content=row.content or "",
+        edited_at=(
+            None
+            if pd.isna(row.edited_at)
+            else pd.Timestamp(row.edited_at, unit="ms", tz="UTC")
+        ),
+        attachments=[None] * int(row.attachments),
+        embeds=[None] * int(row.embeds),
+        mentions=[SimpleNamespace(id=i) for i in row.mentions],
+        role_mentions=[SimpleNamespace(id=i) for i in row.mentioned_role_ids],
+        reactions=reactions,
+        pinned=row.pinned,
+        jump_url=row.jump_url,
+    )
+
+
+def ingestion_workload(cache_path: str, samples: int) -> list:
+    rows = sample_rows(cache_path, INGESTION_MESSAGES * 5)
+    cache_df = rows.iloc[: len(rows) - INGESTION_MESSAGES]
+    messages = [
+        fake_message(row)
+        for row in rows.iloc[len(cache_df) :].itertuples(index=False)
+    ]
+
+    # Même chemin que le bot : conversion, part ajoutée au cache puis compaction
+    with tempfile.TemporaryDirectory() as replay_dir:
+        base_path = os.path.join(replay_dir, "base.parquet")
+        replay_path = os.path.join(replay_dir, CACHE_FILENAME)
+        write_message_cache(cache_df, base_path)
+
+        def restore() -> None:
+            shutil.copyfile(base_path, replay_path)
+
+        def replay() -> None:
+            df = compact_timestamps(
+                pd.DataFrame([create_message_data(message) for message in messages])
+            )
+            append_cache_part(df, replay_path)
+            compact_message_cache(replay_path)
+
+        return timed_samples(samples, replay, restore)
+
+
+def len_content_workload(cache_path: str, samples: int) -> list:
+    contents = sample_rows(cache_path, LEN_CONTENT_MESSAGES)["content"].fillna("")
+    contents = contents.tolist()
+    return timed_samples(
+        samples, lambda: [get_len_content(content) for content in contents]
+    )
+
+
+def prepare_workload(cache_path: str, server_data: dict, samples: int) -> list:
+    cache_df = read_cache(cache_path)
+    return timed_samples(samples, lambda: prepare_dataframe(cache_df, server_data))
+
+
+def callbacks_workload(data_dir: str, server_data: dict, samples: int) -> dict:
+    df = drop_text_columns(
+        prepare_dataframe(
+            read_cache(os.path.join(data_dir, CACHE_FILENAME)), server_data
+        )
+    )
+    text_path = os.path.join(data_dir, MESSAGE_TEXT_FILENAME)
+    text_store = MessageTextStore(text_path) if os.path.exists(text_path) else None
+    app = create_app(df, server_data, MUDAE_CHANNELS, text_store=text_store)
+    data_start = df["timestamp"].iloc[0].date()
+    data_end = df["timestamp"].iloc[-1].date()
+    del df
+
+    client = DashClient(app)
+    client.fire(UPDATE_OUTPUT, {})
+    results: dict = {f"callback:{s['name']}": [] for s in UPDATE_SCENARIOS}
+    results["callback:profile_card"] = []
+    for r in range(samples):
+        end = data_end - timedelta(days=r + 1)
+        for scenario in UPDATE_SCENARIOS:
+            start = (
+                data_start
+                if scenario["days"] is None
+                else end - timedelta(days=scenario["days"])
+            )
+            seconds, _ = client.fire(
+                UPDATE_OUTPUT,
+                {
+                    ("date-picker-range", "start_date"): start.isoformat(),
+                    ("date-picker-range", "end_date"): end.isoformat(),
+                    **RESET_PROPS,
+                    **scenario["props"],
+                },
+            )
+            results[f"callback:{scenario['name']}"].append(seconds)
+
+            if scenario is UPDATE_SCENARIOS[0]:
+                users = client.props.get(("user-dropdown", "value")) or [None]
+                seconds, _ = client.fire(
+                    PROFILE_OUTPUT, {("highlight-user-dropdown", "value"): users[0]}
+                )
+                results["callback:profile_card"].append(seconds)
+    return results
+
+
+def run_workloads(data_dir: str, samples: int, workloads: list) -> dict:
+    cache_path = os.path.join(data_dir, CACHE_FILENAME)
+    with open(os.path.join(data_dir, SERVER_DATA_FILENAME), encoding="utf-8") as f:
+        server_data = json.load(f)
+
+    results = {}
+    if "ingestion" in workloads:
+        results["ingestion"] = ingestion_workload(cache_path, samples)
+    if "len_content" in workloads:
+        results["len_content"] = len_content_workload(cache_path, samples)
+    if "prepare" in workloads:
+        results["prepare"] = prepare_workload(cache_path, server_data, samples)
+    if "callbacks" in workloads:
+        results.update(callbacks_workload(data_dir, server_data, samples))
+    return {
+        name: [round(second, 6) for second in seconds]
+        for name, seconds in results.items()
+    }
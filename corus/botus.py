@@ -10,6 +10,15 @@ import pandas as pd
 
 from dataus.constant import DATA_DIR, ID_NAME_MAP, SERVER_DATA_FILENAME
 
+from .parquetus import (
+    append_cache_part,
+    cache_part_paths,
+    compact_message_cache,
+    message_cache_exists,
+    read_message_cache,
+)
+from .snowflakus import compact_timestamps, datetime_to_epoch_ms
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
@@ -30,8 +39,7 @@ def create_message_data(message: discord.Message) -> dict:
         "channel_id": message.channel.id,
         "content": message.content,
         "len_content": get_len_content(message.content),
-        "created_at": message.created_at,
-        "edited_at": message.edited_at,
+        "edited_at": datetime_to_epoch_ms(message.edited_at),
         "attachments": len(message.attachments),
         "embeds": len(message.embeds),
         "mentions": [m.id for m in message.mentions],
@@ -75,10 +83,13 @@ async def fetch_channel_messages_as_df(
     if cache_df is not None and not cache_df.empty:
         channel_messages = cache_df[cache_df["channel_id"] == channel.id]
         if not channel_messages.empty:
-            after_date = pd.to_datetime(channel_messages["created_at"].max())
+            # L'id du dernier message suffit à Discord pour reprendre après lui
+            after_date = discord.Object(id=int(channel_messages["message_id"].max()))
 
     after_str = (
-        f"after {after_date.strftime('%Y-%m-%d')}" if after_date else "from beginning"
+        f"after {after_date.created_at.strftime('%Y-%m-%d')}"
+        if after_date
+        else "from beginning"
     )
 
     messages_data = []
@@ -146,7 +157,7 @@ async def fetch_channel_messages_as_df(
     except Exception as e:
         logging.exception(f"Error fetching #{channel.name}")
 
-    return pd.DataFrame(messages_data)
+    return compact_timestamps(pd.DataFrame(messages_data))
 
 
 async def run_bot_logic(
@@ -215,10 +226,9 @@ async def run_bot_logic(
 
     cache_path = os.path.join(data_dir, cache_file)
     cache_df = None
-    if os.path.exists(cache_path):
+    if message_cache_exists(cache_path):
         try:
-            cache_df = pd.read_parquet(cache_path)
-            cache_df["created_at"] = pd.to_datetime(cache_df["created_at"])
+            cache_df = read_message_cache(cache_path)
         except Exception as e:
             logging.error(f"Error loading cache: {e}.")
             cache_df = None
@@ -247,6 +257,7 @@ async def run_bot_logic(
             if not df.empty:
                 logging.info(f"[{i}/{len(text_channels)}] Processing #{channel.name}")
                 if cache_df.empty:
+                    cache_df = df
                     logging.info(f"Added {len(df)} messages from #{channel.name}")
                 else:
                     initial_count = len(cache_df)
@@ -257,12 +268,19 @@ async def run_bot_logic(
                     logging.info(f"Added {new_count} new messages from #{channel.name}")
                 
                 try:
-                    cache_df.to_parquet(cache_path, index=False)
+                    append_cache_part(df, cache_path)
                 except Exception as e:
                     logging.error(f"Error saving parquet file: {e}")
         except Exception as e:
             logging.exception(f"Error fetching #{channel.name}")
 
+    # Une seule réécriture de la base par exécution, et aucune sans nouveau message
+    if cache_part_paths(cache_path):
+        try:
+            compact_message_cache(cache_path)
+        except Exception as e:
+            logging.error(f"Error compacting parquet cache: {e}")
+
     final_df = cache_df
 
     await client.close()
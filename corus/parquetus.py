@@ -0,0 +1,215 @@
+import fcntl
+import logging
+import os
+import threading
+import time
+from typing import Callable, Iterable, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from dataus.constant import (
+    CACHE_PLAIN_COLUMNS,
+    CACHE_ROW_GROUP_SIZE,
+    CACHE_SORT_COLUMNS,
+)
+
+from .snowflakus import compact_timestamps, snowflake_at
+
+CACHE_PARTS_SUFFIX = ".parts"
+# Statistiques min/max gardées sur les colonnes qui servent à filtrer
+CACHE_STATISTICS_COLUMNS = ["message_id", "channel_id", "author_id"]
+
+
+def write_message_cache(df: pd.DataFrame, path: str) -> None:
+    write_cache_table(pa.Table.from_pandas(df, preserve_index=False), path)
+
+
+def write_cache_table(table: pa.Table, path: str) -> None:
+    # Trié par salon puis par id : chaque groupe couvre un salon et une période
+    names = table.column_names
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(
+        table.sort_by([(col, "ascending") for col in CACHE_SORT_COLUMNS]),
+        tmp_path,
+        compression="zstd",
+        row_group_size=CACHE_ROW_GROUP_SIZE,
+        # Dictionnaire partout sauf sur les colonnes quasi uniques
+        use_dictionary=[col for col in names if col not in CACHE_PLAIN_COLUMNS],
+        write_statistics=[col for col in CACHE_STATISTICS_COLUMNS if col in names],
+    )
+    os.replace(tmp_path, path)
+    logging.info(
+        f"Wrote message cache to {path} ({os.path.getsize(path) / 1e6:.1f} MB)."
+    )
+
+
+def cache_filter(
+    channel_ids: Optional[Iterable[int]] = None, since=None, until=None
+) -> Optional[pc.Expression]:
+    # Les bornes de temps deviennent des bornes d'id, comparées aux statistiques
+    conditions = []
+    if channel_ids is not None:
+        conditions.append(pc.field("channel_id").isin([int(c) for c in channel_ids]))
+    if since is not None:
+        conditions.append(pc.field("message_id") >= snowflake_at(since))
+    if until is not None:
+        conditions.append(pc.field("message_id") < snowflake_at(until))
+    if not conditions:
+        return None
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+def cache_parts_dir(path: str) -> str:
+    return f"{path}{CACHE_PARTS_SUFFIX}"
+
+
+def cache_part_paths(path: str) -> list:
+    parts_dir = cache_parts_dir(path)
+    try:
+        names = sorted(os.listdir(parts_dir))
+    except FileNotFoundError:
+        return []
+    return [
+        os.path.join(parts_dir, name) for name in names if name.endswith(".parquet")
+    ]
+
+
+def append_cache_part(df: pd.DataFrame, path: str) -> str:
+    # Les nouveaux messages vont dans une petite part, la base n'est pas réécrite
+    parts_dir = cache_parts_dir(path)
+    os.makedirs(parts_dir, exist_ok=True)
+    part_path = os.path.join(parts_dir, f"part-{time.time_ns()}-{os.getpid()}.parquet")
+    write_message_cache(df, part_path)
+    return part_path
+
+
+def read_cache_file(
+    path: str,
+    columns: Optional[list],
+    exclude: Iterable[str],
+    filters: Optional[pc.Expression],
+) -> Optional[pd.DataFrame]:
+    try:
+        if columns is None:
+            skipped = set(exclude) | {"created_at"}
+            columns = [
+                name for name in pq.read_schema(path).names if name not in skipped
+            ]
+        table = pq.read_table(path, columns=columns, filters=filters)
+    except FileNotFoundError:
+        return None
+    return compact_timestamps(table.to_pandas())
+
+
+def read_cache_files(
+    path: str,
+    parts: list,
+    columns: Optional[list] = None,
+    exclude: Iterable[str] = (),
+    filters: Optional[pc.Expression] = None,
+) -> pd.DataFrame:
+    # Parts lues avant la base : une part absorbée entre-temps y est déjà
+    frames = [read_cache_file(part, columns, exclude, filters) for part in parts]
+    frames = [read_cache_file(path, columns, exclude, filters)] + frames
+    frames = [frame for frame in frames if frame is not None]
+    if not frames:
+        raise FileNotFoundError(path)
+    if len(frames) == 1:
+        return frames[0]
+    # La version la plus récente d'un message l'emporte
+    return pd.concat(frames, ignore_index=True).drop_duplicates(
+        "message_id", keep="last", ignore_index=True
+    )
+
+
+def read_message_cache(
+    path: str,
+    columns: Optional[list] = None,
+    exclude: Iterable[str] = (),
+    channel_ids: Optional[Iterable[int]] = None,
+    since=None,
+    until=None,
+) -> pd.DataFrame:
+    return read_cache_files(
+        path,
+        cache_part_paths(path),
+        columns,
+        exclude,
+        cache_filter(channel_ids, since, until),
+    )
+
+
+def message_cache_exists(path: str) -> bool:
+    return os.path.exists(path) or bool(cache_part_paths(path))
+
+
+def compact_message_cache(path: str) -> Optional[pd.DataFrame]:
+    with open(f"{path}.lock", "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            logging.info(f"Message cache {path} is already being compacted.")
+            return None
+        # Seules les parts lues sont supprimées, celles écrites pendant restent
+        parts = cache_part_paths(path)
+        # Sans part, la base est déjà à jour : la réécrire forcerait un rechargement
+        if not parts:
+            logging.info(f"No cache parts to compact into {path}.")
+            return None
+        df = read_cache_files(path, parts)
+        write_message_cache(df, path)
+        for part in parts:
+            os.remove(part)
+    logging.info(f"Compacted {len(parts)} parts into {path} ({len(df)} messages).")
+    return df
+
+
+class CacheCompactor:
+    def __init__(
+        self,
+        path: str,
+        on_compact: Optional[Callable[[pd.DataFrame], None]] = None,
+    ) -> None:
+        self.path = path
+        self.on_compact = on_compact
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def compact(self) -> bool:
+        df = compact_message_cache(self.path)
+        if df is None:
+            return False
+        if self.on_compact is not None:
+            self.on_compact(df)
+        return True
+
+    def start(self, interval: float) -> None:
+        if interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(interval,), name="cache-compaction", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self, interval: float) -> None:
+        pending = None
+        while not self._stop.wait(interval):
+            parts = cache_part_paths(self.path)
+            # On attend qu'aucune part n'arrive pendant un intervalle entier
+            if not parts or parts != pending:
+                pending = parts or None
+                continue
+            try:
+                self.compact()
+            except Exception as e:
+                logging.warning(f"Could not compact the message cache: {e}")
+            pending = None
@@ -0,0 +1,70 @@
+import logging
+
+import pandas as pd
+
+from dataus.constant import ID_NAME_MAP, IDS_TO_EXCLUDE, SMURF_IDS
+
+from .snowflakus import snowflake_timestamps
+
+
+def prepare_dataframe(df: pd.DataFrame, server_data: dict) -> pd.DataFrame:
+    if df.empty:
+        logging.warning("DataFrame is empty, skipping preparation.")
+        return df
+
+    df_copy = df.copy()
+
+    author_map = {int(k): v["name"] for k, v in server_data.get("members", {}).items()}
+    
+    for id_str, name in ID_NAME_MAP.items():
+        author_id = int(id_str)
+        if author_id not in author_map:
+            author_map[author_id] = name
+    
+    channel_map = {
+        int(k): v["name"] for k, v in server_data.get("channels", {}).items()
+    }
+
+    df_copy["author_name"] = df_copy["author_id"].map(author_map)
+    df_copy["channel_name"] = df_copy["channel_id"].map(channel_map)
+
+    mask_unknown = df_copy["author_name"].isna()
+    df_copy.loc[mask_unknown, "author_name"] = df_copy.loc[mask_unknown].apply(
+        lambda row: row.get("author_discord_name", f"Ex-membre ({row['author_id']})"),
+        axis=1
+    )
+    df_copy = df_copy.drop(columns=["created_at"], errors="ignore")
+    df_copy["timestamp"] = snowflake_timestamps(df_copy["message_id"])
+
+    EXCLUDE_LIST = list(IDS_TO_EXCLUDE) + list(SMURF_IDS)
+    df_copy = df_copy[~df_copy["author_id"].isin(EXCLUDE_LIST)]
+
+    active_user_count = len(df_copy["author_name"].unique())
+
+    if "top_reaction_count" in df_copy.columns:
+        df_copy["total_reaction_count"] = df_copy["top_reaction_count"]
+
+    numeric_cols = ["len_content", "total_reaction_count", "attachments", "embeds"]
+    for col in numeric_cols:
+        df_copy[col] = df_copy.get(col, 0).fillna(0).astype(int) if col in df_copy.columns else 0
+
+    list_cols = ["mentions", "mentioned_role_ids", "reactions"]
+    for col in list_cols:
+        if col in df_copy.columns:
+            df_copy[col] = df_copy[col].fillna("[]").apply(
+                lambda x: x if isinstance(x, (list, str)) else "[]"
+            )
+        else:
+            df_copy[col] = "[]"
+
+    optional_cols = ["edited_at", "pinned", "content", "jump_url"]
+    for col in optional_cols:
+        if col not in df_copy.columns:
+            df_copy[col] = pd.NA
+
+    df_copy = df_copy.sort_values("timestamp", kind="stable", ignore_index=True)
+
+    logging.info(
+        f"Preparation complete. {len(df_copy)} messages and {active_user_count} active users retained."
+    )
+    return df_copy
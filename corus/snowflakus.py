@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from dataus.constant import DISCORD_EPOCH_MS, SNOWFLAKE_TIMESTAMP_SHIFT
+
+
+def snowflake_epoch_ms(ids) -> np.ndarray:
+    # Les 42 bits de poids fort d'un snowflake sont les ms depuis l'epoch Discord
+    return (
+        np.asarray(ids, dtype="int64") >> SNOWFLAKE_TIMESTAMP_SHIFT
+    ) + DISCORD_EPOCH_MS
+
+
+def snowflake_timestamps(ids: pd.Series) -> pd.Series:
+    milliseconds = snowflake_epoch_ms(ids)
+    return pd.Series(
+        milliseconds.astype("datetime64[ms]").astype("datetime64[ns]"),
+        index=ids.index,
+    ).dt.tz_localize("UTC")
+
+
+def snowflake_at(when) -> int:
+    # Plus petit id possible pour un message envoyé à cet instant
+    moment = pd.Timestamp(when)
+    if moment.tzinfo is None:
+        moment = moment.tz_localize("UTC")
+    milliseconds = datetime_to_epoch_ms(moment) - DISCORD_EPOCH_MS
+    return milliseconds << SNOWFLAKE_TIMESTAMP_SHIFT
+
+
+def datetime_to_epoch_ms(value: Optional[datetime]) -> Optional[int]:
+    return None if value is None else round(value.timestamp() * 1000)
+
+
+def compact_timestamps(df: pd.DataFrame) -> pd.DataFrame:
+    # Anciens caches : created_at est redondant avec l'id, edited_at devient un entier
+    df = df.drop(columns=["created_at"], errors="ignore")
+    if "edited_at" not in df.columns:
+        return df
+    edited = df["edited_at"]
+    if pd.api.types.is_datetime64_any_dtype(edited):
+        missing = edited.isna().to_numpy()
+        milliseconds = edited.to_numpy(dtype="datetime64[ms]").view("int64")
+        df["edited_at"] = pd.arrays.IntegerArray(
+            np.where(missing, 0, milliseconds), missing
+        )
+    elif edited.dtype != "Int64":
+        df["edited_at"] = edited.astype("Int64")
+    return df
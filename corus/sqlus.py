@@ -0,0 +1,91 @@
+import json
+import os
+from typing import Optional
+
+import pandas as pd
+
+from dataus.constant import DISCORD_EPOCH_MS, SNOWFLAKE_TIMESTAMP_SHIFT
+
+from .parquetus import cache_part_paths
+
+SQL_MEMORY_LIMIT = "1GB"
+
+
+def sql_list(paths: list) -> str:
+    return "[" + ", ".join("'" + path.replace("'", "''") + "'" for path in paths) + "]"
+
+
+def server_tables(server_data_path: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    with open(server_data_path, encoding="utf-8") as f:
+        server_data = json.load(f)
+    members = pd.DataFrame(
+        {
+            "author_id": [int(k) for k in server_data.get("members", {})],
+            "author_name": [
+                v["name"] for v in server_data.get("members", {}).values()
+            ],
+        }
+    )
+    channels = pd.DataFrame(
+        {
+            "channel_id": [int(k) for k in server_data.get("channels", {})],
+            "channel_name": [
+                v["name"] for v in server_data.get("channels", {}).values()
+            ],
+        }
+    )
+    return members, channels
+
+
+def connect_message_store(
+    cache_path: str,
+    server_data_path: Optional[str] = None,
+    memory_limit: str = SQL_MEMORY_LIMIT,
+):
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("SQL queries require duckdb: pip install -e .[sql]") from e
+
+    files = [path for path in [cache_path] if os.path.exists(path)]
+    files += cache_part_paths(cache_path)
+    if not files:
+        raise FileNotFoundError(cache_path)
+
+    # Les requêtes lisent le Parquet par morceaux et débordent sur disque au-delà
+    connection = duckdb.connect()
+    connection.execute(f"SET memory_limit = '{memory_limit}'")
+    # Les parts ont des noms plus grands que la base : la plus récente passe devant
+    latest = (
+        "QUALIFY row_number() OVER (PARTITION BY message_id ORDER BY filename DESC) = 1"
+        if len(files) > 1
+        else ""
+    )
+    connection.execute(
+        f"""
+        CREATE VIEW messages AS
+        SELECT
+            * EXCLUDE (filename, edited_at),
+            epoch_ms(
+                (message_id >> {SNOWFLAKE_TIMESTAMP_SHIFT}) + {DISCORD_EPOCH_MS}
+            ) AS timestamp,
+            epoch_ms(edited_at) AS edited_at
+        FROM read_parquet({sql_list(files)}, union_by_name = true, filename = true)
+        {latest}
+        """
+    )
+    if server_data_path is not None:
+        members, channels = server_tables(server_data_path)
+        connection.register("members", members)
+        connection.register("channels", channels)
+    return connection
+
+
+def run_query(
+    query: str, cache_path: str, server_data_path: Optional[str] = None
+) -> pd.DataFrame:
+    connection = connect_message_store(cache_path, server_data_path)
+    try:
+        return connection.sql(query).df()
+    finally:
+        connection.close()
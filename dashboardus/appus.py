@@ -1,15 +1,32 @@
+from typing import Callable, Optional
+
 import dash
 import dash_bootstrap_components as dbc
 import pandas as pd
 
 from .callbackus import register_callbacks
+from .datasetus import DashboardData, DatasetStore
+from .jobus import ThreadJobManager
 from .layoutus import create_layout
+from .metricus import install_metrics
+from .storus import MessageTextStore
 
 EXTERNAL_STYLESHEETS = [dbc.themes.BOOTSTRAP, dbc.icons.FONT_AWESOME]
 
 
 def create_app(
-    df: pd.DataFrame, server_data_map: dict, mudae_channel_ids: list
+    df: pd.DataFrame,
+    server_data_map: dict,
+    mudae_channel_ids: list,
+    result_cache_dir: Optional[str] = None,
+    background_jobs_dir: Optional[str] = None,
+    profile_callbacks: bool = False,
+    dataset_loader: Optional[Callable[[], tuple]] = None,
+    watch_paths: Optional[list] = None,
+    reload_interval: float = 0,
+    text_store: Optional[MessageTextStore] = None,
+    approximate_stats: bool = False,
+    server_data_path: Optional[str] = None,
 ) -> dash.Dash:
     app = dash.Dash(
         __name__,
@@ -19,7 +36,25 @@ def create_app(
     )
 
     app.title = "Virgule du 4'"
-    app.layout = create_layout(df)
-    register_callbacks(app, df, server_data_map, mudae_channel_ids)
+
+    def load_dataset() -> DashboardData:
+        new_df, new_server_data_map = dataset_loader()
+        return DashboardData(
+            new_df, new_server_data_map, mudae_channel_ids, text_store
+        )
+
+    store = DatasetStore(
+        DashboardData(df, server_data_map, mudae_channel_ids, text_store),
+        load_dataset if dataset_loader else None,
+        watch_paths,
+        server_data_path,
+    )
+    app.layout = lambda: create_layout(store.current.df)
+    install_metrics(app, profile_all=profile_callbacks)
+    job_manager = ThreadJobManager(background_jobs_dir) if background_jobs_dir else None
+    register_callbacks(
+        app, store, result_cache_dir, job_manager, approximate_stats
+    )
+    store.start_polling(reload_interval)
 
     return app
@@ -0,0 +1,38 @@
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    dashboard: {
+        toggleSidebar: function (nClicks, isOpen, styles) {
+            if (nClicks) {
+                isOpen = !isOpen;
+            }
+            const current = isOpen ? styles.open : styles.closed;
+            return [current.sidebar, current.content, current.header, isOpen];
+        },
+
+        toggleView: function (view) {
+            const shown = { display: "block" };
+            const hidden = { display: "none" };
+            return view === "table" ? [hidden, shown] : [shown, hidden];
+        },
+
+        highlightTrace: function (highlighted, figure) {
+            if (!figure || !figure.data) {
+                return window.dash_clientside.no_update;
+            }
+            const data = figure.data.map(function (trace) {
+                const name = (trace.name || "").split(" (")[0];
+                const isHighlighted = name === highlighted;
+                const updated = Object.assign({}, trace);
+                updated.line = Object.assign({}, trace.line, {
+                    width: isHighlighted ? 4 : 2,
+                });
+                if (trace.mode && trace.mode.indexOf("markers") !== -1) {
+                    updated.marker = Object.assign({}, trace.marker, {
+                        size: isHighlighted ? 10 : 6,
+                    });
+                }
+                return updated;
+            });
+            return Object.assign({}, figure, { data: data });
+        },
+    },
+});
@@ -0,0 +1,229 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def estimate_nbytes(value: Any) -> int:
+    # deep=True : les chaînes des colonnes objet comptent, pas seulement les pointeurs
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_nbytes(k) + estimate_nbytes(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class FrameCache:
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict = OrderedDict()
+        self._sizes: dict = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: Hashable, builder: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = builder()
+        size = estimate_nbytes(value)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+            self._evict()
+        return value
+
+    def peek(self, key: Hashable) -> Any:
+        with self._lock:
+            return self._entries.get(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._total_bytes = 0
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or self._total_bytes > self.max_bytes
+        ):
+            key, _ = self._entries.popitem(last=False)
+            self._total_bytes -= self._sizes.pop(key)
+            logging.debug(
+                f"Evicted {key} from frame cache ({self._total_bytes / 1e6:.1f} MB kept)"
+            )
+
+
+def column_hashes(series: pd.Series) -> np.ndarray:
+    try:
+        return pd.util.hash_pandas_object(series, index=False).to_numpy()
+    except TypeError:
+        # Listes et tableaux numpy : hachés via leurs octets
+        values = series.map(
+            lambda v: v.tobytes() if isinstance(v, np.ndarray) else str(v)
+        )
+        return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    digest = hashlib.sha1()
+    digest.update(str(len(df)).encode())
+    digest.update(json.dumps(list(map(str, df.columns))).encode())
+    if not df.empty:
+        # Toutes les colonnes comptent : une édition ou une réaction garde le même id
+        hashed_rows = np.zeros(len(df), dtype=np.uint64)
+        for col in df.columns:
+            hashed_rows = hashed_rows * np.uint64(1000003) ^ column_hashes(df[col])
+        digest.update(str(int(hashed_rows.sum())).encode())
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(frame_version: str, server_data_map: dict) -> str:
+    digest = hashlib.sha1(frame_version.encode())
+    digest.update(json.dumps(server_data_map, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def normalize_key(parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class ResultCache:
+    def __init__(
+        self,
+        max_entries: int,
+        cache_dir: Optional[str] = None,
+        max_disk_entries: int = 0,
+    ) -> None:
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.max_disk_entries = max_disk_entries
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, namespace: str, parts: Any, builder: Callable[[], Any]) -> Any:
+        key = f"{namespace}-{normalize_key(parts)}"
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        value = self._read_disk(key)
+        if value is None:
+            value = builder()
+            self._write_disk(key, value)
+
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def peek(self, namespace: str, parts: Any) -> Any:
+        key = f"{namespace}-{normalize_key(parts)}"
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        return self._read_disk(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _read_disk(self, key: str) -> Any:
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)
+            return value
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Dropping unreadable result cache entry {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logging.warning(f"Could not write result cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self._disk_writes += 1
+        if self.max_disk_entries and self._disk_writes % 32 == 0:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        try:
+            entries = [
+                entry
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".pkl")
+            ]
+        except OSError:
+            return
+        if len(entries) <= self.max_disk_entries:
+            return
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in entries[: len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
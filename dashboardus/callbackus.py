@@ -1,62 +1,155 @@
 import calendar
+import functools
 import json
+import logging
+import math
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional
 
 import dash
 import dash_bootstrap_components as dbc
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import dcc, html
-from dash.dependencies import Input, Output, State
-
-from dataus.constant import EXCLUDED_CHANNEL_IDS, MIN_MESSAGE_COUNT
-
-
-def create_table_from_figure(fig: go.Figure) -> html.Div:
-    if not fig or not fig.data:
-        return html.P("No data available", className="text-muted")
-    
-    rows = []
-    headers = []
-    
-    for trace in fig.data:
-        if hasattr(trace, 'x') and hasattr(trace, 'y'):
-            trace_name = trace.name if trace.name else "Value"
-            if not headers:
-                headers = ["X", trace_name]
-                rows = [[x, y] for x, y in zip(trace.x, trace.y)]
-            else:
-                headers.append(trace_name)
-                for i, (x, y) in enumerate(zip(trace.x, trace.y)):
-                    if i < len(rows):
-                        rows[i].append(y)
-    
-    if not rows:
+from dash import Patch, dash_table, dcc, html
+from dash.dependencies import MATCH, ClientsideFunction, Input, Output, State
+from dash.long_callback.managers import BaseLongCallbackManager
+
+from dataus.constant import (
+    DISTRIBUTION_TOP_USERS,
+    EXCLUDED_CHANNEL_IDS,
+    MIN_MESSAGE_COUNT,
+    RESULT_CACHE_MAX_DISK_ENTRIES,
+    RESULT_CACHE_MAX_ENTRIES,
+    TABLE_PAGE_SIZE,
+    TOP_REACTIONS_COUNT,
+    TRACE_POINT_BUDGET,
+    USER_OPTIONS_SEARCH_LIMIT,
+    USER_OPTIONS_SEARCH_THRESHOLD,
+)
+
+from .cachus import ResultCache, normalize_key
+from .datasetus import DashboardData, DatasetStore
+from .histogramus import LengthHistogram
+from .indexus import NANOSECONDS_PER_DAY, RowSelection, TimeRangeIndex
+from .leaderus import DailyActivity, period_winners, standings
+from .metricus import metrics, timed
+from .reactus import TopReactionIndex
+from .samplus import downsample_figure, needs_downsampling, refine_patch, relayout_x_range
+from .sketchus import DistinctCounter, LengthSketch
+from .storus import with_message_text
+
+
+def figure_to_frame(fig: go.Figure) -> pd.DataFrame:
+    columns = []
+    for trace in fig.data if fig else []:
+        if trace.type == "heatmap":
+            frame = pd.DataFrame(trace.z, index=trace.y, columns=trace.x)
+            frame.index.name = "X"
+            frame.columns = [str(col) for col in frame.columns]
+            return frame.reset_index()
+
+        x_values = getattr(trace, "x", None)
+        y_values = getattr(trace, "y", None)
+        if x_values is None or y_values is None:
+            continue
+        if getattr(trace, "orientation", None) == "h":
+            x_values, y_values = y_values, x_values
+
+        values = pd.Series(
+            np.asarray(y_values),
+            index=pd.Index(np.asarray(x_values)),
+            name=trace.name if trace.name else "Value",
+        )
+        values = values[values.index.notna() & ~values.index.duplicated()]
+        if not values.empty:
+            columns.append(values)
+
+    if not columns:
+        return pd.DataFrame()
+
+    frame = pd.concat(columns, axis=1, sort=False)
+    frame.index.name = "X"
+    return frame.reset_index()
+
+
+def table_page_records(
+    frame: pd.DataFrame,
+    page_current: int,
+    page_size: int,
+    sort_by: Optional[list] = None,
+) -> list[dict]:
+    if sort_by:
+        column = frame.iloc[:, int(sort_by[0]["column_id"][1:])]
+        order = column.sort_values(
+            ascending=sort_by[0]["direction"] == "asc",
+            kind="stable",
+            na_position="last",
+        ).index
+        frame = frame.loc[order]
+
+    start = page_current * page_size
+    page = frame.iloc[start : start + page_size].copy()
+    page.columns = [f"c{i}" for i in range(len(page.columns))]
+    for col in page.columns:
+        if pd.api.types.is_datetime64_any_dtype(page[col]):
+            page[col] = page[col].dt.strftime("%Y-%m-%d")
+    return page.to_dict("records")
+
+
+def create_paged_table(frame: pd.DataFrame, panel: str, token: str) -> html.Div:
+    if frame.empty:
         return html.P("No data to display", className="text-muted")
-    
-    table_header = [html.Thead(html.Tr([html.Th(h) for h in headers]))]
-    table_body = [html.Tbody([html.Tr([html.Td(cell) for cell in row]) for row in rows])]
-    
-    return dbc.Table(
-        table_header + table_body,
-        bordered=True,
-        hover=True,
-        striped=True,
-        responsive=True,
-        className="table-sm",
-        style={"maxHeight": "500px", "overflowY": "auto"}
+
+    return html.Div(
+        [
+            dcc.Store(id={"type": "paged-table-token", "panel": panel}, data=token),
+            dash_table.DataTable(
+                id={"type": "paged-table", "panel": panel},
+                columns=[
+                    {"name": str(name), "id": f"c{i}"}
+                    for i, name in enumerate(frame.columns)
+                ],
+                data=table_page_records(frame, 0, TABLE_PAGE_SIZE),
+                page_current=0,
+                page_size=TABLE_PAGE_SIZE,
+                page_count=max(1, math.ceil(len(frame) / TABLE_PAGE_SIZE)),
+                page_action="custom",
+                sort_action="custom",
+                sort_mode="single",
+                sort_by=[],
+                style_table={"overflowX": "auto"},
+                style_cell={"textAlign": "left", "fontFamily": "inherit"},
+                style_header={"fontWeight": "bold"},
+            ),
+        ]
     )
 
 
-def render_view(content, view_toggle: str, is_figure: bool = True):
-    if view_toggle == "table" and is_figure:
-        return create_table_from_figure(content)
-    elif view_toggle == "graph" and is_figure:
-        return dcc.Graph(figure=content, style={"height": "600px"})
-    else:
-        return content
+def figure_cosmetics(fig: go.Figure) -> list:
+    return [
+        [
+            trace.name,
+            getattr(getattr(trace, "line", None), "width", None),
+            getattr(getattr(trace, "marker", None), "size", None),
+        ]
+        for trace in fig.data
+    ]
+
+
+def cosmetic_patch(previous: list, current: list) -> Patch:
+    patch = Patch()
+    for i, (old, new) in enumerate(zip(previous, current)):
+        name, line_width, marker_size = new
+        if old[0] != name:
+            patch["data"][i]["name"] = name
+        if old[1] != line_width:
+            patch["data"][i]["line"]["width"] = line_width or 2
+        if old[2] != marker_size:
+            patch["data"][i]["marker"]["size"] = marker_size or 6
+    return patch
+
 
 SIDEBAR_STYLE = {
     "position": "fixed",
@@ -97,9 +190,16 @@ HEADER_STYLE_FULL = {
     "transition": "all 0.3s",
 }
 
+UPDATE_PROGRESS_STEPS = 8
+LENGTH_COLUMNS = ["timestamp", "person_id", "len_content"]
+
 
 def register_callbacks(
-    app: dash.Dash, df: pd.DataFrame, server_data_map: dict, mudae_channel_ids: list
+    app: dash.Dash,
+    store: DatasetStore,
+    result_cache_dir: Optional[str] = None,
+    job_manager: Optional[BaseLongCallbackManager] = None,
+    approximate_stats: bool = False,
 ) -> None:
     days_order = [
         "Monday",
@@ -134,37 +234,377 @@ def register_callbacks(
         "December",
     ]
 
-    mudae_ids_set = set(int(id_str) for id_str in mudae_channel_ids)
+    result_cache = ResultCache(
+        RESULT_CACHE_MAX_ENTRIES, result_cache_dir, RESULT_CACHE_MAX_DISK_ENTRIES
+    )
+    metrics.register_gauge(
+        "frame_cache_entries", lambda: len(store.current.frame_cache)
+    )
+    metrics.register_gauge(
+        "frame_cache_mb", lambda: store.current.frame_cache.total_bytes / 1e6
+    )
+    metrics.register_gauge("result_cache_entries", lambda: len(result_cache))
+
+    def get_base_rows(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> RowSelection:
+        def build() -> RowSelection:
+            df = data.df
+            mask = df["person_id"].to_numpy() >= 0
+            if not include_mudae:
+                mask &= ~df["channel_id"].isin(data.mudae_ids_set).to_numpy()
+            if virgule_filter == "virgule_only":
+                mask &= df["author_id"].isin(data.virgule_author_ids).to_numpy()
+            elif virgule_filter == "no_virgule":
+                mask &= df["author_id"].isin(data.non_virgule_author_ids).to_numpy()
+            # Des positions plutôt qu'une copie filtrée : le jeu mappé reste partagé
+            return RowSelection(df, None if mask.all() else np.flatnonzero(mask))
+
+        return data.frame_cache.get(("base", include_mudae, virgule_filter), build)
+
+    def get_author_counts(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> pd.Series:
+        return data.frame_cache.get(
+            ("author_counts", include_mudae, virgule_filter),
+            lambda: data.people.totals(
+                get_base_rows(data, include_mudae, virgule_filter).values("person_id")
+            ),
+        )
+
+    def get_period_counts(
+        data: DashboardData,
+        window_key: tuple,
+        base_rows: RowSelection,
+        window_lo: int,
+        window_hi: int,
+        metric_selected: str,
+    ) -> pd.Series:
+        def build() -> pd.Series:
+            if window_lo >= window_hi:
+                return pd.Series(dtype="int64")
+            person_ids = base_rows.values("person_id", window_lo, window_hi)
+            if metric_selected == "characters":
+                return data.people.totals(
+                    person_ids, base_rows.values("len_content", window_lo, window_hi)
+                )
+            return data.people.totals(person_ids)
 
-    author_map = server_data_map.get("members", {})
-    role_map = server_data_map.get("roles", {})
+        return data.frame_cache.get(
+            ("period_counts",) + window_key + (metric_selected,), build
+        )
 
-    user_id_to_name_map = {int(k): v["name"] for k, v in author_map.items()}
-    user_id_to_original_name_map = {
-        int(k): v["original_name"] for k, v in author_map.items()
-    }
-    name_to_user_id_map = {v["name"]: int(k) for k, v in author_map.items()}
-    user_id_to_color_map = {k: v["top_role_color"] for k, v in author_map.items()}
-    role_names_map = {k: v["name"] for k, v in role_map.items()}
+    def get_result(data: DashboardData, namespace: str, parts: tuple, builder):
+        return result_cache.get(namespace, (data.version,) + parts, builder)
 
-    virgule_role_name = "Virgule du 4'"
-    virgule_role_ids = {
-        id for id, data in role_map.items() if data["name"] == virgule_role_name
-    }
+    def render_panel(
+        data: DashboardData,
+        fig: go.Figure,
+        panel: str,
+        parts: tuple,
+        previous_panels: dict,
+        rendered_panels: dict,
+    ) -> tuple:
+        token = normalize_key((data.version, panel) + parts)
+        cosmetics = figure_cosmetics(fig)
+        rendered_panels[panel] = {"token": token, "cosmetics": cosmetics}
+
+        previous = previous_panels.get(panel)
+        if previous and previous.get("token") == token:
+            if previous.get("cosmetics") == cosmetics:
+                return dash.no_update, dash.no_update
+            return cosmetic_patch(previous["cosmetics"], cosmetics), dash.no_update
+
+        frame = result_cache.get("table", (token,), lambda: figure_to_frame(fig))
+        if needs_downsampling(fig, TRACE_POINT_BUDGET):
+            result_cache.get("figure", (token,), lambda: fig)
+            fig = downsample_figure(fig, TRACE_POINT_BUDGET, token)
+        return fig, create_paged_table(frame, panel, token)
+
+    def peek_panel(namespace: str, panel: str, token: str, rendered_panels: dict):
+        value = result_cache.peek(namespace, (token,))
+        inputs = (rendered_panels or {}).get("inputs")
+        if value is not None or inputs is None:
+            return value
+        # Rendu par un autre worker ou évincé : on rejoue les filtres du rendu
+        rebuilt_token = build_dashboard(None, *inputs, None)[-1].get(panel, {})
+        return result_cache.peek(namespace, (rebuilt_token.get("token"),))
+
+    def window_bounds(start_date, end_date) -> tuple[pd.Timestamp, pd.Timestamp]:
+        start_date_utc = pd.to_datetime(start_date, utc=True)
+        end_date_utc = pd.to_datetime(end_date, utc=True).replace(
+            hour=23, minute=59, second=59
+        )
+        return start_date_utc, end_date_utc
 
-    virgule_author_ids = set()
-    non_virgule_author_ids = set()
-    current_member_ids_int = set()
+    def make_window_key(
+        include_mudae: bool,
+        virgule_filter: str,
+        start_date_utc: pd.Timestamp,
+        end_date_utc: pd.Timestamp,
+    ) -> tuple:
+        return (
+            include_mudae,
+            virgule_filter,
+            start_date_utc.isoformat(),
+            end_date_utc.isoformat(),
+        )
 
-    for uid, data in author_map.items():
-        user_id_int = int(uid)
-        current_member_ids_int.add(user_id_int)
-        user_roles = set(str(r) for r in data.get("roles", []))
+    def get_time_index(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> TimeRangeIndex:
+        return data.frame_cache.get(
+            ("time_index", include_mudae, virgule_filter),
+            lambda: TimeRangeIndex(
+                get_base_rows(data, include_mudae, virgule_filter).columns(
+                    ["timestamp", "person_id"]
+                )
+            ),
+        )
 
-        if not virgule_role_ids.isdisjoint(user_roles):
-            virgule_author_ids.add(user_id_int)
+    def get_reaction_index(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> TopReactionIndex:
+        return data.frame_cache.get(
+            ("reaction_index", include_mudae, virgule_filter),
+            lambda: TopReactionIndex(
+                get_base_rows(data, include_mudae, virgule_filter).columns(
+                    ["timestamp", "total_reaction_count"]
+                ),
+                TOP_REACTIONS_COUNT,
+            ),
+        )
+
+    def get_length_histogram(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> LengthHistogram:
+        return data.frame_cache.get(
+            ("length_histogram", include_mudae, virgule_filter),
+            lambda: LengthHistogram(
+                get_base_rows(data, include_mudae, virgule_filter).columns(
+                    LENGTH_COLUMNS
+                ),
+                data.people.names,
+            ),
+        )
+
+    def get_length_sketch(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> LengthSketch:
+        return data.frame_cache.get(
+            ("length_sketch", include_mudae, virgule_filter),
+            lambda: LengthSketch(
+                get_base_rows(data, include_mudae, virgule_filter).columns(
+                    LENGTH_COLUMNS
+                ),
+                data.people.names,
+            ),
+        )
+
+    def get_distinct_counter(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> DistinctCounter:
+        return data.frame_cache.get(
+            ("distinct_counter", include_mudae, virgule_filter),
+            lambda: DistinctCounter(
+                get_base_rows(data, include_mudae, virgule_filter).columns(
+                    ["timestamp", "person_id"]
+                )
+            ),
+        )
+
+    def get_top_reacted(
+        data: DashboardData,
+        include_mudae: bool,
+        virgule_filter: str,
+        window_lo: int,
+        window_hi: int,
+    ) -> Optional[pd.DataFrame]:
+        if "total_reaction_count" not in data.df.columns:
+            return None
+        reaction_index = get_reaction_index(data, include_mudae, virgule_filter)
+        top_reacted = get_base_rows(data, include_mudae, virgule_filter).take(
+            reaction_index.top(window_lo, window_hi)
+        )
+        if data.text_store is None:
+            return top_reacted
+        # Le texte n'est lu que pour les k messages affichés
+        return with_message_text(top_reacted, data.text_store)
+
+    def get_daily_activity(data: DashboardData) -> DailyActivity:
+        return data.frame_cache.get(
+            ("daily_activity",),
+            lambda: DailyActivity.from_frame(data.df, data.mudae_ids_set),
+        )
+
+    def get_period_winners(
+        data: DashboardData,
+        include_mudae: bool,
+        virgule_filter: str,
+        start_date_utc: pd.Timestamp,
+        end_date_utc: pd.Timestamp,
+    ) -> dict:
+        def build() -> dict:
+            allowed_author_ids = {
+                "virgule_only": data.virgule_author_ids,
+                "no_virgule": data.non_virgule_author_ids,
+            }.get(virgule_filter)
+            activity = get_daily_activity(data).window(
+                start_date_utc,
+                end_date_utc,
+                include_mudae,
+                data.people,
+                allowed_author_ids,
+            )
+            return period_winners(activity, data.people.names)
+
+        return data.frame_cache.get(
+            ("period_winners",)
+            + make_window_key(
+                include_mudae, virgule_filter, start_date_utc, end_date_utc
+            ),
+            build,
+        )
+
+    def warm_dataset(data: DashboardData) -> None:
+        previous_activity = store.current.frame_cache.peek(("daily_activity",))
+        if previous_activity is not None:
+            # Seuls les jours à partir du dernier jour connu sont réagrégés
+            data.frame_cache.get(
+                ("daily_activity",),
+                lambda: previous_activity.extend(data.df, data.mudae_ids_set),
+            )
+        get_time_index(data, False, "everyone")
+        get_author_counts(data, False, "everyone")
+        if "total_reaction_count" in data.df.columns:
+            get_reaction_index(data, False, "everyone")
+        if approximate_stats:
+            get_length_sketch(data, False, "everyone")
+            get_distinct_counter(data, False, "everyone")
         else:
-            non_virgule_author_ids.add(user_id_int)
+            get_length_histogram(data, False, "everyone")
+
+    store.on_load(warm_dataset)
+    store.on_swap(lambda data: result_cache.clear())
+
+    def get_user_options(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> list[dict]:
+        def build() -> list[dict]:
+            user_counts_all_time = get_author_counts(
+                data, include_mudae, virgule_filter
+            )
+            user_options = []
+            for author_name, message_count in user_counts_all_time.items():
+                if message_count < MIN_MESSAGE_COUNT:
+                    continue
+
+                author_id = data.name_to_user_id_map.get(author_name)
+                if not author_id:
+                    continue
+
+                is_member = author_id in data.current_member_ids_int
+                color = (
+                    data.user_id_to_color_map.get(str(author_id), "#6c757d")
+                    if is_member
+                    else "#6c757d"
+                )
+                original_name = data.user_id_to_original_name_map.get(
+                    author_id, author_name
+                )
+
+                user_options.append(
+                    {
+                        "label": html.Div(
+                            [
+                                html.Span(
+                                    author_name,
+                                    style={
+                                        "color": color,
+                                        "textDecoration": (
+                                            "line-through" if not is_member else "none"
+                                        ),
+                                        "fontWeight": "bold",
+                                    },
+                                ),
+                                html.Span(original_name, style={"display": "none"}),
+                            ]
+                        ),
+                        "value": author_name,
+                        "search": f"{author_name} {original_name}",
+                    }
+                )
+            return user_options
+
+        return data.frame_cache.get(
+            ("user_options", include_mudae, virgule_filter), build
+        )
+
+    def options_are_searched(
+        data: DashboardData, include_mudae: bool, virgule_filter: str
+    ) -> bool:
+        return (
+            len(get_user_options(data, include_mudae, virgule_filter))
+            > USER_OPTIONS_SEARCH_THRESHOLD
+        )
+
+    def visible_user_options(
+        user_options: list[dict], selected: list, search_value: str = ""
+    ) -> list[dict]:
+        if len(user_options) <= USER_OPTIONS_SEARCH_THRESHOLD:
+            return user_options
+
+        # Au-delà du seuil, seuls la sélection et les résultats de recherche sont envoyés
+        selected = set(selected or [])
+        needle = (search_value or "").lower()
+        visible = [option for option in user_options if option["value"] in selected]
+        matches = [
+            option
+            for option in user_options
+            if option["value"] not in selected and needle in option["search"].lower()
+        ]
+        return visible + matches[:USER_OPTIONS_SEARCH_LIMIT]
+
+    def get_user_styles(data: DashboardData, users_key: tuple) -> str:
+        def build() -> str:
+            style_rules = []
+            for person_id in users_key:
+                user = data.people.names[person_id]
+                safe_user = str(user).replace('"', '\\"')
+                user_id = int(data.people.account_ids[person_id])
+                is_member = user_id in data.current_member_ids_int
+
+                bg_color = data.people.colors[person_id] if is_member else "#f8f9fa"
+                text_color = (
+                    ("#000000" if is_light_color(bg_color) else "#FFFFFF")
+                    if is_member
+                    else "#6c757d"
+                )
+                decoration = "none" if is_member else "line-through"
+
+                rule = f""".Select-value[title="{safe_user}"] {{
+                     background-color: {bg_color} !important;
+                     color: {text_color} !important;
+                     border-radius: 4px;
+                     text-decoration: {decoration};
+                 }}"""
+                style_rules.append(rule)
+            return f"<style>{''.join(style_rules)}</style>"
+
+        return data.frame_cache.get(("user_styles", users_key), build)
+
+    def unless_rendered(
+        name: str,
+        parts: tuple,
+        builder: Callable,
+        previous_panels: dict,
+        rendered_panels: dict,
+    ):
+        token = normalize_key(parts)
+        rendered_panels[name] = {"token": token}
+        if previous_panels.get(name, {}).get("token") == token:
+            return dash.no_update
+        return builder()
 
     def is_light_color(hex_color: str) -> bool:
         try:
@@ -179,28 +619,135 @@ def register_callbacks(
         except (ValueError, TypeError):
             return True
 
-    @app.callback(
+    app.clientside_callback(
+        ClientsideFunction(namespace="dashboard", function_name="toggleSidebar"),
         Output("filter-sidebar", "style"),
         Output("page-content", "style"),
         Output("page-header", "style"),
         Output("sidebar-state-store", "data"),
         Input("open-filter-sidebar", "n_clicks"),
         State("sidebar-state-store", "data"),
+        State("sidebar-styles-store", "data"),
     )
-    def toggle_sidebar(n: int, is_open: bool) -> tuple:
-        if n:
-            is_open = not is_open
-
-        if is_open:
-            sidebar_style = SIDEBAR_STYLE
-            content_style = CONTENT_STYLE
-            header_style = HEADER_STYLE
-        else:
-            sidebar_style = SIDEBAR_HIDDEN
-            content_style = CONTENT_STYLE_FULL
-            header_style = HEADER_STYLE_FULL
 
-        return sidebar_style, content_style, header_style, is_open
+    for panel in ["evolution", "distribution", "median-length", "mentioned-users"]:
+        app.clientside_callback(
+            ClientsideFunction(namespace="dashboard", function_name="toggleView"),
+            Output(f"{panel}-container", "style"),
+            Output(f"{panel}-table-container", "style"),
+            Input(f"{panel}-view-toggle", "value"),
+        )
+
+    app.clientside_callback(
+        ClientsideFunction(namespace="dashboard", function_name="highlightTrace"),
+        Output("evolution-graph", "figure", allow_duplicate=True),
+        Input("highlight-user-dropdown", "value"),
+        State("evolution-graph", "figure"),
+        prevent_initial_call=True,
+    )
+
+    @app.callback(
+        Output("user-profile-card-container", "children"),
+        Input("highlight-user-dropdown", "value"),
+        Input("date-picker-range", "start_date"),
+        Input("date-picker-range", "end_date"),
+        Input("metric-selector", "value"),
+        Input("virgule-filter", "value"),
+        Input("mudae-filter-switch", "value"),
+    )
+    def update_profile_card(
+        highlighted_user_name: str,
+        start_date: str,
+        end_date: str,
+        metric_selected: str,
+        virgule_filter: str,
+        mudae_switch_value: bool,
+    ):
+        if not highlighted_user_name or not start_date or not end_date:
+            return []
+
+        data = store.current
+        include_mudae = bool(mudae_switch_value)
+        start_date_utc, end_date_utc = window_bounds(start_date, end_date)
+        base_rows = get_base_rows(data, include_mudae, virgule_filter)
+        window_lo, window_hi = get_time_index(
+            data, include_mudae, virgule_filter
+        ).bounds(start_date_utc, end_date_utc)
+        window_key = make_window_key(
+            include_mudae, virgule_filter, start_date_utc, end_date_utc
+        )
+        return create_user_profile_card(
+            highlighted_user_name,
+            base_rows.window(window_lo, window_hi),
+            get_period_counts(
+                data, window_key, base_rows, window_lo, window_hi, metric_selected
+            ),
+            metric_selected,
+        )
+
+    @app.callback(
+        Output({"type": "paged-table", "panel": MATCH}, "data"),
+        Input({"type": "paged-table", "panel": MATCH}, "page_current"),
+        Input({"type": "paged-table", "panel": MATCH}, "page_size"),
+        Input({"type": "paged-table", "panel": MATCH}, "sort_by"),
+        State({"type": "paged-table-token", "panel": MATCH}, "data"),
+        State("rendered-panels-store", "data"),
+        prevent_initial_call=True,
+    )
+    def page_table(
+        page_current: int,
+        page_size: int,
+        sort_by: list,
+        token: str,
+        rendered_panels: dict,
+    ) -> list[dict]:
+        panel = dash.callback_context.outputs_list["id"]["panel"]
+        frame = peek_panel("table", panel, token, rendered_panels)
+        if frame is None:
+            return []
+        return table_page_records(
+            frame, page_current or 0, page_size or TABLE_PAGE_SIZE, sort_by
+        )
+
+    @app.callback(
+        Output("user-dropdown", "options", allow_duplicate=True),
+        Input("user-dropdown", "search_value"),
+        State("user-dropdown", "value"),
+        State("virgule-filter", "value"),
+        State("mudae-filter-switch", "value"),
+        prevent_initial_call=True,
+    )
+    def search_users(
+        search_value: str,
+        selected_user_names: list,
+        virgule_filter: str,
+        mudae_switch_value: bool,
+    ):
+        data = store.current
+        include_mudae = bool(mudae_switch_value)
+        if not options_are_searched(data, include_mudae, virgule_filter):
+            return dash.no_update
+        return visible_user_options(
+            get_user_options(data, include_mudae, virgule_filter),
+            selected_user_names,
+            search_value,
+        )
+
+    @app.callback(
+        Output("evolution-graph", "figure", allow_duplicate=True),
+        Input("evolution-graph", "relayoutData"),
+        State("rendered-panels-store", "data"),
+        prevent_initial_call=True,
+    )
+    def refine_evolution_graph(relayout_data: dict, rendered_panels: dict):
+        x_range, changed = relayout_x_range(relayout_data)
+        token = (rendered_panels or {}).get("evolution", {}).get("token")
+        if not changed or not token:
+            return dash.no_update
+        full_figure = peek_panel("figure", "evolution", token, rendered_panels)
+        if full_figure is None:
+            return dash.no_update
+        return refine_patch(full_figure, TRACE_POINT_BUDGET, x_range)
 
     @app.callback(
         Output("date-range-display", "children"),
@@ -218,94 +765,83 @@ def register_callbacks(
             f"{years} year(s), {days} day(s)" if years > 0 else f"{delta.days} day(s)"
         )
 
-    @app.callback(
-        Output("evolution-container", "children"),
+    update_all_dependencies = [
+        Output("evolution-graph", "figure"),
         Output("user-dropdown", "options"),
         Output("user-dropdown", "value"),
         Output("dynamic-styles", "children"),
-        Output("user-profile-card-container", "children"),
         Output("highlight-user-dropdown", "options"),
         Output("top-n-dropdown", "value"),
         Output("date-range-dropdown", "value"),
         Output("date-picker-range", "start_date"),
         Output("date-picker-range", "end_date"),
-        Output("median-length-container", "children"),
-        Output("distribution-container", "children"),
+        Output("median-length-graph", "figure"),
+        Output("distribution-graph", "figure"),
         Output("monthly-leaderboard-msg", "children"),
         Output("daily-leaderboard-msg-container", "children"),
         Output("monthly-leaderboard-char", "children"),
         Output("daily-leaderboard-char-container", "children"),
-        Output("mentioned-users-container", "children"),
+        Output("mentioned-users-graph", "figure"),
         Output("top-reacted-messages", "children"),
+        Output("evolution-table-container", "children"),
+        Output("distribution-table-container", "children"),
+        Output("median-length-table-container", "children"),
+        Output("mentioned-users-table-container", "children"),
+        Output("rendered-panels-store", "data"),
         Input("user-dropdown", "value"),
         Input("date-picker-range", "start_date"),
         Input("date-picker-range", "end_date"),
         Input("top-n-dropdown", "value"),
         Input("metric-selector", "value"),
         Input("evolution-graph-selector", "value"),
-        Input("highlight-user-dropdown", "value"),
         Input("date-range-dropdown", "value"),
         Input("virgule-filter", "value"),
         Input("distribution-time-unit", "value"),
         Input("daily-leaderboard-toggle", "value"),
         Input("mudae-filter-switch", "value"),
-        Input("evolution-view-toggle", "value"),
-        Input("distribution-view-toggle", "value"),
-        Input("median-length-view-toggle", "value"),
-        Input("mentioned-users-view-toggle", "value"),
+        State("highlight-user-dropdown", "value"),
         State("date-picker-range", "min_date_allowed"),
         State("date-picker-range", "max_date_allowed"),
-    )
-    def update_all(
+        State("rendered-panels-store", "data"),
+    ]
+
+    def build_dashboard(
+        set_progress: Optional[Callable],
         selected_user_names: list[str],
         start_date: str,
         end_date: str,
         top_n: int,
         metric_selected: str,
         evolution_view: str,
-        highlighted_user_name: str,
         date_range_period: str,
         virgule_filter: str,
         dist_time_unit: str,
         daily_toggle: bool,
         mudae_switch_value: bool,
-        evolution_view_toggle: str,
-        distribution_view_toggle: str,
-        median_length_view_toggle: str,
-        mentioned_users_view_toggle: str,
+        highlighted_user_name: str,
         min_date_allowed: str,
         max_date_allowed: str,
+        previous_panels: Optional[dict],
     ) -> tuple:
         ctx = dash.callback_context
         triggered_id = (
             ctx.triggered[0]["prop_id"].split(".")[0] if ctx.triggered else None
         )
-        
-        print(f"[DEBUG] Callback triggered by: {triggered_id}")
-        print(f"[DEBUG] DataFrame shape: {df.shape}")
-        print(f"[DEBUG] selected_user_names: {selected_user_names}")
-        print(f"[DEBUG] top_n: {top_n}")
 
-        # S'assurer que les timestamps sont en UTC
-        if df["timestamp"].dt.tz is None:
-            df["timestamp"] = df["timestamp"].dt.tz_localize("UTC")
+        def report(step: int, label: str) -> None:
+            if set_progress is not None:
+                set_progress((step, UPDATE_PROGRESS_STEPS, label))
 
-        if not mudae_switch_value:
-            base_df = df[~df["channel_id"].isin(mudae_ids_set)].copy()
-        else:
-            base_df = df.copy()
-
-        if virgule_filter == "virgule_only":
-            author_id_pool = virgule_author_ids
-        elif virgule_filter == "no_virgule":
-            author_id_pool = non_virgule_author_ids
-        else:
-            author_id_pool = None
+        report(0, "Filtering messages")
+        data = store.current
+        
+        logging.debug(f"Callback triggered by: {triggered_id}")
+        logging.debug(f"DataFrame shape: {data.df.shape}")
+        logging.debug(f"selected_user_names: {selected_user_names}")
+        logging.debug(f"top_n: {top_n}")
 
-        if author_id_pool is not None:
-            base_df = base_df[base_df["author_id"].isin(author_id_pool)]
-        base_df["author_name"] = base_df["author_id"].map(user_id_to_name_map)
-        base_df = base_df.dropna(subset=["author_name"])
+        include_mudae = bool(mudae_switch_value)
+        base_rows = get_base_rows(data, include_mudae, virgule_filter)
 
         new_top_n_value = top_n
         if triggered_id == "user-dropdown":
@@ -323,9 +859,9 @@ def register_callbacks(
             new_date_range_period = "last_365"
         elif triggered_id == "date-range-dropdown":
             today = datetime.now()
-            if date_range_period == "all-time":
-                output_start_date = base_df["timestamp"].min().date()
-                output_end_date = base_df["timestamp"].max().date()
+            if date_range_period == "all-time" and not base_rows.empty:
+                first, last = base_rows.take([0, -1])["timestamp"]
+                output_start_date, output_end_date = first.date(), last.date()
             elif date_range_period == "current_year":
                 output_start_date, output_end_date = (
                     today.replace(month=1, day=1).date(),
@@ -347,48 +883,22 @@ def register_callbacks(
                     today.date(),
                 )
 
-        start_date_utc = pd.to_datetime(output_start_date, utc=True)
-        end_date_utc = pd.to_datetime(output_end_date, utc=True).replace(
-            hour=23, minute=59, second=59
-        )
+        start_date_utc, end_date_utc = window_bounds(output_start_date, output_end_date)
 
-        dff = base_df[
-            (base_df["timestamp"] >= start_date_utc)
-            & (base_df["timestamp"] <= end_date_utc)
-        ].copy()
-
-        if not dff.empty:
-            dff["month_year"] = (
-                dff["timestamp"]
-                .dt.tz_convert("Europe/Paris")
-                .dt.to_period("M")
-                .astype(str)
-            )
-            dff["hour_of_day"] = dff["timestamp"].dt.tz_convert("Europe/Paris").dt.hour
-            dff["weekday"] = dff["timestamp"].dt.day_name()
-            dff["month_name"] = dff["timestamp"].dt.month_name()
-            dff["year"] = dff["timestamp"].dt.year
-        else:
-            for col in ["month_year", "hour_of_day", "weekday", "month_name", "year"]:
-                dff[col] = pd.NA
-
-        if metric_selected == "characters" and not dff.empty:
-            user_counts_period = (
-                dff.groupby("author_name")["len_content"]
-                .sum()
-                .sort_values(ascending=False)
-            )
-        elif not dff.empty:
-            user_counts_period = dff["author_name"].value_counts()
-        else:
-            user_counts_period = pd.Series(dtype="int64")
+        time_index = get_time_index(data, include_mudae, virgule_filter)
+        window_lo, window_hi = time_index.bounds(start_date_utc, end_date_utc)
+        window_key = make_window_key(
+            include_mudae, virgule_filter, start_date_utc, end_date_utc
+        )
+        user_counts_period = get_period_counts(
+            data, window_key, base_rows, window_lo, window_hi, metric_selected
+        )
 
-        user_counts_all_time = base_df["author_name"].value_counts()
-        sorted_users_by_count = user_counts_all_time.index.tolist()
+        user_counts_all_time = get_author_counts(data, include_mudae, virgule_filter)
         
-        print(f"[DEBUG] base_df shape after filters: {base_df.shape}")
-        print(f"[DEBUG] user_counts_all_time length: {len(user_counts_all_time)}")
-        print(f"[DEBUG] Top 5 users: {user_counts_all_time.head().to_dict()}")
+        logging.debug(f"base rows after filters: {len(base_rows)}")
+        logging.debug(f"user_counts_all_time length: {len(user_counts_all_time)}")
+        logging.debug(f"Top 5 users: {user_counts_all_time.head().to_dict()}")
 
         # Au chargement initial ou changement de filtre, définir les utilisateurs par défaut
         if triggered_id is None or triggered_id in [
@@ -415,93 +925,96 @@ def register_callbacks(
             # L'utilisateur a modifié la sélection manuellement
             user_value = selected_user_names if selected_user_names else []
         
-        print(f"[DEBUG] Final user_value: {user_value}")
+        logging.debug(f"Final user_value: {user_value}")
         
-        user_options = []
-        for author_name in sorted_users_by_count:
-            message_count = user_counts_all_time.get(author_name, 0)
-            if message_count < MIN_MESSAGE_COUNT:
-                continue
-                
-            author_id = name_to_user_id_map.get(author_name)
-            if not author_id:
-                continue
-
-            is_member = author_id in current_member_ids_int
-            color = (
-                user_id_to_color_map.get(str(author_id), "#6c757d")
-                if is_member
-                else "#6c757d"
+        # Les clés de cache portent les codes person_id, pas les noms
+        selected_people = data.people.ids(user_value)
+        users_key = tuple(sorted(selected_people))
+
+        # La fenêtre n'est matérialisée que si un graphique doit être recalculé
+        @functools.cache
+        def get_dff() -> pd.DataFrame:
+            return base_rows.window(window_lo, window_hi)
+
+        @functools.cache
+        def get_dff_filtered() -> pd.DataFrame:
+            if not user_value:
+                return get_dff()
+            return base_rows.take(
+                window_lo
+                + time_index.author_rows(selected_people, window_lo, window_hi)
             )
 
-            user_options.append(
-                {
-                    "label": html.Div(
-                        [
-                            html.Span(
-                                author_name,
-                                style={
-                                    "color": color,
-                                    "textDecoration": (
-                                        "line-through" if not is_member else "none"
-                                    ),
-                                    "fontWeight": "bold",
-                                },
-                            ),
-                            html.Span(
-                                user_id_to_original_name_map.get(
-                                    author_id, author_name
-                                ),
-                                style={"display": "none"},
-                            ),
-                        ]
+        def get_median_length_stats() -> tuple:
+            if approximate_stats:
+                # Fusion des esquisses journalières : coût en jours, pas en messages
+                first_day = start_date_utc.value // NANOSECONDS_PER_DAY
+                last_day = end_date_utc.value // NANOSECONDS_PER_DAY
+                sketch = get_length_sketch(data, include_mudae, virgule_filter)
+                median_lengths = sketch.medians(
+                    first_day, last_day, user_value or None
+                )
+                return (
+                    median_lengths if not median_lengths.empty else None,
+                    sketch.overall_median(first_day, last_day),
+                    get_distinct_counter(data, include_mudae, virgule_filter).count(
+                        first_day, last_day
                     ),
-                    "value": author_name,
-                }
-            )
-
-        dff_filtered = dff[dff["author_name"].isin(user_value)] if user_value else dff
-
-        style_rules = []
-        for user in user_value:
-            safe_user = str(user).replace('"', '\\"')
-            user_id = name_to_user_id_map.get(user, "")
-            is_member = user_id in current_member_ids_int
+                )
 
-            bg_color = (
-                user_id_to_color_map.get(str(user_id), "#6c757d")
-                if is_member
-                else "#f8f9fa"
-            )
-            text_color = (
-                ("#000000" if is_light_color(bg_color) else "#FFFFFF")
-                if is_member
-                else "#6c757d"
+            # Histogrammes exacts par (membre, mois), lignes lues en bord de fenêtre
+            histogram = get_length_histogram(data, include_mudae, virgule_filter)
+            median_lengths = histogram.medians(
+                window_lo, window_hi, user_value or None
             )
-            decoration = "none" if is_member else "line-through"
-
-            rule = f""".Select-value[title="{safe_user}"] {{
-                 background-color: {bg_color} !important;
-                 color: {text_color} !important;
-                 border-radius: 4px;
-                 text-decoration: {decoration};
-             }}"""
-            style_rules.append(rule)
-        final_styles = f"<style>{''.join(style_rules)}</style>"
-
-        profile_card = []
-        if highlighted_user_name:
-            profile_card = create_user_profile_card(
-                highlighted_user_name, dff, user_counts_period, metric_selected
+            return (
+                median_lengths if not median_lengths.empty else None,
+                histogram.overall_quantile(window_lo, window_hi, 0.5),
+                histogram.active_members(window_lo, window_hi),
             )
 
-        highlight_options = [{"label": user, "value": user} for user in user_value]
-        color_map = {
-            user: user_id_to_color_map.get(
-                str(name_to_user_id_map.get(user)), "#6c757d"
-            )
-            for user in user_value
+        previous_panels = previous_panels or {}
+        # Filtres résolus, rejoués si un tableau ou une figure manque au cache
+        rendered_panels = {
+            "inputs": [
+                user_value,
+                str(output_start_date),
+                str(output_end_date),
+                new_top_n_value,
+                metric_selected,
+                evolution_view,
+                new_date_range_period,
+                virgule_filter,
+                dist_time_unit,
+                daily_toggle,
+                mudae_switch_value,
+                highlighted_user_name,
+                min_date_allowed,
+                max_date_allowed,
+            ]
         }
+        options_parts = (data.version, include_mudae, virgule_filter)
+        if options_are_searched(data, include_mudae, virgule_filter):
+            options_parts += users_key
+        user_options = unless_rendered(
+            "user-options",
+            options_parts,
+            lambda: visible_user_options(
+                get_user_options(data, include_mudae, virgule_filter), user_value
+            ),
+            previous_panels,
+            rendered_panels,
+        )
+        final_styles = unless_rendered(
+            "user-styles",
+            (data.version, users_key),
+            lambda: get_user_styles(data, users_key),
+            previous_panels,
+            rendered_panels,
+        )
+
+        highlight_options = [{"label": user, "value": user} for user in user_value]
+        color_map = {user: data.people.color(user) for user in user_value}
 
         empty_figure = go.Figure(
             layout={
@@ -518,13 +1031,12 @@ def register_callbacks(
             className="text-center text-muted p-4",
         )
 
-        if dff.empty:
+        if window_lo >= window_hi:
             return (
                 empty_figure,
                 user_options,
                 user_value,
                 final_styles,
-                profile_card,
                 highlight_options,
                 new_top_n_value,
                 new_date_range_period,
@@ -538,77 +1050,226 @@ def register_callbacks(
                 empty_leaderboard,
                 empty_figure,
                 empty_list_component,
+                empty_list_component,
+                empty_list_component,
+                empty_list_component,
+                empty_list_component,
+                rendered_panels,
             )
 
+        report(1, "Building activity graph")
+        evolution_parts = window_key + (evolution_view, users_key, metric_selected)
         if evolution_view == 0:
-            fig_evolution = create_cumulative_graph(
-                dff_filtered, color_map, metric_selected, highlighted_user_name
+            fig_evolution = get_result(
+                data,
+                "cumulative",
+                evolution_parts + (highlighted_user_name,),
+                lambda: create_cumulative_graph(
+                    get_dff_filtered(), color_map, metric_selected, highlighted_user_name
+                ),
             )
         else:
-            fig_evolution = create_monthly_graph(
-                dff_filtered, color_map, metric_selected, highlighted_user_name
+            fig_evolution = get_result(
+                data,
+                "monthly",
+                evolution_parts + (highlighted_user_name,),
+                lambda: create_monthly_graph(
+                    get_dff_filtered(), color_map, metric_selected, highlighted_user_name
+                ),
             )
 
-        fig_median_length = create_median_length_graph(dff_filtered, dff, color_map)
-        fig_distribution = create_distribution_graph(
-            dff_filtered,
-            dff,
-            user_counts_period,
-            color_map,
-            dist_time_unit,
-            metric_selected,
+        report(2, "Computing message lengths")
+        median_length_parts = window_key + (users_key,)
+        fig_median_length = get_result(
+            data,
+            "median_length_approx" if approximate_stats else "median_length",
+            median_length_parts,
+            lambda: create_median_length_graph(
+                *get_median_length_stats(), color_map, approximate_stats
+            ),
         )
-        fig_mentioned = create_most_mentioned_graph(
-            dff,
-            color_map,
-            user_id_to_name_map,
-            role_names_map,
-            name_to_user_id_map,
-            user_id_to_color_map,
+        report(3, "Computing activity distribution")
+        distribution_parts = window_key + (users_key, dist_time_unit, metric_selected)
+        fig_distribution = get_result(
+            data,
+            "distribution",
+            distribution_parts,
+            lambda: create_distribution_graph(
+                get_dff(),
+                user_counts_period,
+                tuple(data.people.names[list(users_key)]),
+                color_map,
+                dist_time_unit,
+                metric_selected,
+            ),
         )
-        top_reactions_component = create_top_reactions_list(
-            dff, user_id_to_color_map, current_member_ids_int
+        report(4, "Counting mentions")
+        fig_mentioned = get_result(
+            data,
+            "mentioned",
+            window_key,
+            lambda: create_most_mentioned_graph(
+                get_dff(),
+                color_map,
+                data.user_id_to_name_map,
+                data.role_names_map,
+                data.name_to_user_id_map,
+                data.user_id_to_color_map,
+            ),
+        )
+        report(5, "Ranking reactions")
+        top_reactions_component = get_result(
+            data,
+            "top_reactions",
+            window_key,
+            lambda: create_top_reactions_list(
+                get_top_reacted(
+                    data, include_mudae, virgule_filter, window_lo, window_hi
+                ),
+                data.user_id_to_name_map,
+                data.user_id_to_color_map,
+                data.current_member_ids_int,
+            ),
         )
 
-        monthly_leaderboard_msg = create_leaderboard(
-            dff, "M", "Months Won", "%B %Y", "messages"
+        report(6, "Building leaderboards")
+        def get_winners() -> dict:
+            return get_period_winners(
+                data, include_mudae, virgule_filter, start_date_utc, end_date_utc
+            )
+
+        monthly_leaderboard_msg = get_result(
+            data,
+            "monthly_wins",
+            window_key + ("messages",),
+            lambda: create_leaderboard(
+                get_winners(), "M", "Months Won", "%B %Y", "messages"
+            ),
         )
-        daily_leaderboard_msg = create_daily_leaderboard(
-            dff, "messages", daily_toggle, start_date_utc, end_date_utc, color_map
+        daily_leaderboard_msg = get_result(
+            data,
+            "daily_wins",
+            window_key + ("messages", daily_toggle, users_key),
+            lambda: create_daily_leaderboard(
+                get_winners(),
+                "messages",
+                daily_toggle,
+                start_date_utc,
+                end_date_utc,
+                color_map,
+            ),
         )
-        monthly_leaderboard_char = create_leaderboard(
-            dff, "M", "Months Won", "%B %Y", "characters"
+        monthly_leaderboard_char = get_result(
+            data,
+            "monthly_wins",
+            window_key + ("characters",),
+            lambda: create_leaderboard(
+                get_winners(), "M", "Months Won", "%B %Y", "characters"
+            ),
         )
-        daily_leaderboard_char = create_daily_leaderboard(
-            dff, "characters", daily_toggle, start_date_utc, end_date_utc, color_map
+        daily_leaderboard_char = get_result(
+            data,
+            "daily_wins",
+            window_key + ("characters", daily_toggle, users_key),
+            lambda: create_daily_leaderboard(
+                get_winners(),
+                "characters",
+                daily_toggle,
+                start_date_utc,
+                end_date_utc,
+                color_map,
+            ),
         )
 
-        evolution_content = render_view(fig_evolution, evolution_view_toggle, True)
-        distribution_content = render_view(fig_distribution, distribution_view_toggle, True)
-        median_length_content = render_view(fig_median_length, median_length_view_toggle, True)
-        mentioned_users_content = render_view(fig_mentioned, mentioned_users_view_toggle, True)
+        report(7, "Rendering views")
+        evolution_graph, evolution_table = render_panel(
+            data,
+            fig_evolution,
+            "evolution",
+            evolution_parts,
+            previous_panels,
+            rendered_panels,
+        )
+        distribution_graph, distribution_table = render_panel(
+            data,
+            fig_distribution,
+            "distribution",
+            distribution_parts,
+            previous_panels,
+            rendered_panels,
+        )
+        median_length_graph, median_length_table = render_panel(
+            data,
+            fig_median_length,
+            "median-length",
+            median_length_parts,
+            previous_panels,
+            rendered_panels,
+        )
+        mentioned_users_graph, mentioned_users_table = render_panel(
+            data,
+            fig_mentioned,
+            "mentioned-users",
+            window_key,
+            previous_panels,
+            rendered_panels,
+        )
 
         return (
-            evolution_content,
+            evolution_graph,
             user_options,
             user_value,
             final_styles,
-            profile_card,
             highlight_options,
             new_top_n_value,
             new_date_range_period,
             output_start_date,
             output_end_date,
-            median_length_content,
-            distribution_content,
+            median_length_graph,
+            distribution_graph,
             monthly_leaderboard_msg,
             daily_leaderboard_msg,
             monthly_leaderboard_char,
             daily_leaderboard_char,
-            mentioned_users_content,
+            mentioned_users_graph,
             top_reactions_component,
+            evolution_table,
+            distribution_table,
+            median_length_table,
+            mentioned_users_table,
+            rendered_panels,
         )
 
+    if job_manager is None:
+
+        @app.callback(*update_all_dependencies)
+        def update_all(*args) -> tuple:
+            return build_dashboard(None, *args)
+
+    else:
+
+        @app.callback(
+            *update_all_dependencies,
+            background=True,
+            manager=job_manager,
+            progress=[
+                Output("update-progress", "value"),
+                Output("update-progress", "max"),
+                Output("update-progress", "label"),
+            ],
+            progress_default=[0, UPDATE_PROGRESS_STEPS, ""],
+            running=[
+                (
+                    Output("update-progress-container", "style"),
+                    {"display": "block"},
+                    {"display": "none"},
+                ),
+            ],
+        )
+        def update_all_in_background(set_progress: Callable, *args) -> tuple:
+            return build_dashboard(set_progress, *args)
+
+    @timed
     def create_user_profile_card(
         user_name: str,
         dff: pd.DataFrame,
@@ -684,6 +1345,7 @@ def register_callbacks(
             ],
         )
 
+    @timed
     def create_cumulative_graph(
         dff_filtered: pd.DataFrame,
         color_map: dict,
@@ -696,7 +1358,7 @@ def register_callbacks(
         if metric_selected == "characters":
             daily_data = (
                 dff_filtered.set_index("timestamp")
-                .groupby("author_name")
+                .groupby("author_name", observed=True)
                 .resample("D")["len_content"]
                 .sum()
                 .reset_index(name="daily_value")
@@ -705,18 +1367,18 @@ def register_callbacks(
         else:
             daily_data = (
                 dff_filtered.set_index("timestamp")
-                .groupby("author_name")
+                .groupby("author_name", observed=True)
                 .resample("D")
                 .size()
                 .reset_index(name="daily_value")
             )
             y_label = "Cumulative Messages"
 
-        daily_data["cumulative_value"] = daily_data.groupby("author_name")[
-            "daily_value"
-        ].cumsum()
+        daily_data["cumulative_value"] = daily_data.groupby(
+            "author_name", observed=True
+        )["daily_value"].cumsum()
         period_totals = (
-            daily_data.groupby("author_name")["daily_value"]
+            daily_data.groupby("author_name", observed=True)["daily_value"]
             .sum()
             .sort_values(ascending=False)
         )
@@ -746,6 +1408,7 @@ def register_callbacks(
 
         return fig
 
+    @timed
     def create_monthly_graph(
         dff_filtered, color_map, metric_selected, highlighted_user
     ):
@@ -754,24 +1417,26 @@ def register_callbacks(
 
         if metric_selected == "characters":
             monthly_values = (
-                dff_filtered.groupby(["author_name", "month_year"])["len_content"]
+                dff_filtered.groupby(["author_name", "month_year"], observed=True)[
+                    "len_content"
+                ]
                 .sum()
                 .reset_index(name="value")
             )
             period_totals = (
-                monthly_values.groupby("author_name")["value"]
+                monthly_values.groupby("author_name", observed=True)["value"]
                 .sum()
                 .sort_values(ascending=False)
             )
             y_label = "Character Count"
         else:
             monthly_values = (
-                dff_filtered.groupby(["author_name", "month_year"])
+                dff_filtered.groupby(["author_name", "month_year"], observed=True)
                 .size()
                 .reset_index(name="value")
             )
             period_totals = (
-                monthly_values.groupby("author_name")["value"]
+                monthly_values.groupby("author_name", observed=True)["value"]
                 .sum()
                 .sort_values(ascending=False)
             )
@@ -809,10 +1474,15 @@ def register_callbacks(
 
         return fig
 
+    @timed
     def create_median_length_graph(
-        dff_filtered: pd.DataFrame, dff: pd.DataFrame, color_map: dict
+        median_lengths: Optional[pd.Series],
+        server_median: Optional[float],
+        active_members: int,
+        color_map: dict,
+        approximate: bool = False,
     ) -> go.Figure:
-        if dff_filtered.empty:
+        if median_lengths is None:
             return go.Figure(
                 layout={
                     "template": "plotly_white",
@@ -822,14 +1492,7 @@ def register_callbacks(
                 }
             )
 
-        median_lengths = (
-            dff_filtered.dropna(subset=["len_content"])
-            .groupby("author_name")["len_content"]
-            .median()
-            .sort_values(ascending=True)
-        )
-        server_median = dff.dropna(subset=["len_content"])["len_content"].median()
-
+        median_lengths = median_lengths.dropna().sort_values(ascending=True)
         if median_lengths.empty:
             return go.Figure(
                 layout={
@@ -877,6 +1540,7 @@ def register_callbacks(
             )
 
         fig.update_layout(
+            title=f"Active members: {'≈' if approximate else ''}{active_members:,}",
             xaxis_title="Median Characters per Message",
             yaxis_title="User",
             template="plotly_white",
@@ -886,17 +1550,16 @@ def register_callbacks(
         )
         return fig
 
+    @timed
     def create_distribution_graph(
-        dff_filtered: pd.DataFrame,
         dff: pd.DataFrame,
         user_counts_period: pd.Series,
+        selected_users: tuple,
         color_map: dict,
         time_unit: str,
         metric_selected: str,
+        top_users_count: int = DISTRIBUTION_TOP_USERS,
     ) -> go.Figure:
-        top_users = user_counts_period.nlargest(3).index.tolist()
-        dff_top = dff_filtered[dff_filtered["author_name"].isin(top_users)]
-
         if dff.empty:
             return go.Figure(
                 layout={
@@ -905,6 +1568,12 @@ def register_callbacks(
                 }
             )
 
+        if time_unit == "weekday_hour":
+            return create_weekly_heatmap(dff, selected_users, metric_selected)
+
+        # Les N plus actifs de la période, qu'ils soient sélectionnés ou non
+        top_users = user_counts_period.nlargest(top_users_count).index.tolist()
+
         if time_unit == "hour":
             x_col, x_label = "hour_of_day", "Hour of Day"
             categories = list(range(24))
@@ -922,47 +1591,31 @@ def register_callbacks(
             categories = sorted(dff[x_col].dropna().unique())
             dtick = 1
 
-        dff_top["x_axis"] = dff_top[x_col]
-        dff["x_axis"] = dff[x_col]
-
+        # Un seul groupby (bucket x auteur) pour le serveur et tous les utilisateurs
+        grouped = dff.groupby([x_col, "author_name"], observed=True, sort=False)
         if metric_selected == "characters":
-            server_values = dff.groupby("x_axis")["len_content"].sum()
+            values = grouped["len_content"].sum()
         else:
-            server_values = dff.groupby("x_axis").size()
+            values = grouped.size()
+        activity = values.unstack("author_name", fill_value=0).reindex(
+            categories, fill_value=0
+        )
 
-        server_values = server_values.reindex(categories).fillna(0)
+        server_values = activity.sum(axis=1)
         server_total = server_values.sum()
         server_percentage = (
-            (server_values / server_total) * 100 if server_total > 0 else 0
+            (server_values / server_total) * 100 if server_total > 0 else server_values
         )
 
-        all_user_data = []
-        for user in top_users:
-            user_df = dff_top[dff_top["author_name"] == user]
-
-            if metric_selected == "characters":
-                user_values_single = user_df.groupby("x_axis")["len_content"].sum()
-            else:
-                user_values_single = user_df.groupby("x_axis").size()
-
-            user_values_reindexed = user_values_single.reindex(categories).fillna(0)
-
-            user_total = user_values_reindexed.sum()
-            user_percentage = (
-                (user_values_reindexed / user_total) * 100 if user_total > 0 else 0
-            )
-
-            user_percentage_df = user_percentage.reset_index()
-            user_percentage_df.columns = ["x_axis", "percentage"]
-            user_percentage_df["author_name"] = user
-            all_user_data.append(user_percentage_df)
+        user_values = activity.reindex(columns=top_users, fill_value=0)
+        user_totals = user_values.sum(axis=0).replace(0, np.nan)
+        user_percentage = (user_values / user_totals * 100).fillna(0)
 
-        if not all_user_data:
-            user_values_final = pd.DataFrame(
-                columns=["x_axis", "percentage", "author_name"]
-            )
-        else:
-            user_values_final = pd.concat(all_user_data, ignore_index=True)
+        user_values_final = (
+            user_percentage.rename_axis(index="x_axis", columns="author_name")
+            .melt(ignore_index=False, value_name="percentage")
+            .reset_index()
+        )
 
         fig = px.line(
             user_values_final,
@@ -973,6 +1626,7 @@ def register_callbacks(
             markers=True,
             template="plotly_white",
             labels={"x_axis": x_label, "percentage": "Activity Share (%)"},
+            category_orders={"author_name": top_users},
         )
 
         fig.add_trace(
@@ -989,129 +1643,119 @@ def register_callbacks(
         fig.update_xaxes(categoryorder="array", categoryarray=categories)
         return fig
 
+    @timed
+    def create_weekly_heatmap(
+        dff: pd.DataFrame, selected_users: tuple, metric_selected: str
+    ) -> go.Figure:
+        if selected_users:
+            dff = dff[dff["author_name"].isin(selected_users)]
+            title = "Selected users"
+        else:
+            title = "Server"
+
+        grouped = dff.groupby(["weekday", "hour_of_day"], observed=True, sort=False)
+        if metric_selected == "characters":
+            values = grouped["len_content"].sum()
+        else:
+            values = grouped.size()
+        activity = (
+            values.unstack("hour_of_day", fill_value=0)
+            .reindex(index=days_order, columns=range(24), fill_value=0)
+            .astype("float64")
+        )
+        total = activity.to_numpy().sum()
+        if total > 0:
+            activity = activity / total * 100
+
+        fig = go.Figure(
+            go.Heatmap(
+                z=activity.to_numpy(),
+                x=list(activity.columns),
+                y=list(activity.index),
+                name=title,
+                colorscale="Blues",
+                colorbar={"title": "Share (%)"},
+                hovertemplate="%{y} %{x}h: %{z:.2f}%<extra></extra>",
+            )
+        )
+        fig.update_layout(
+            template="plotly_white",
+            xaxis={"title": "Hour of Day", "dtick": 2},
+            yaxis={"title": "Day of Week", "autorange": "reversed"},
+        )
+        return fig
+
+    @timed
     def create_leaderboard(
-        dff: pd.DataFrame,
+        winners: dict,
         period: str,
         metric_name: str,
         date_format: str,
         metric_selected: str,
     ) -> html.Ul:
-        if dff.empty:
+        if not winners:
             return html.P("No data.", className="text-center p-3")
 
-        if metric_selected == "characters":
-            resampled = (
-                dff.groupby([dff["timestamp"].dt.to_period(period), "author_name"])[
-                    "len_content"
-                ]
-                .sum()
-                .reset_index(name="value")
-            )
-        else:
-            resampled = (
-                dff.groupby([dff["timestamp"].dt.to_period(period), "author_name"])
-                .size()
-                .reset_index(name="value")
-            )
-
-        if resampled.empty:
-            return html.P("Not enough data.", className="text-center p-3")
-
-        winners = resampled.loc[resampled.groupby("timestamp")["value"].idxmax()]
-        wins_df = winners.groupby("author_name")["timestamp"].agg(list).reset_index()
-        wins_df[metric_name] = wins_df["timestamp"].apply(len)
-        wins_df = wins_df.sort_values(metric_name, ascending=False).head(10)
-
+        wins_df = standings(winners[(period, metric_selected)])
         items = [
             html.Li(
                 className="list-group-item d-flex justify-content-between align-items-center leaderboard-item",
-                title=", ".join([d.strftime(date_format) for d in row["timestamp"]]),
+                title=", ".join(
+                    [pd.Timestamp(d).strftime(date_format) for d in periods]
+                ),
                 children=[
                     html.Div(
                         [
-                            html.Span(f"{i + 1}.", className="leaderboard-rank"),
-                            html.Span(row["author_name"]),
+                            html.Span(f"{rank}.", className="leaderboard-rank"),
+                            html.Span(author_name),
                         ]
                     ),
-                    html.Span(f"{row[metric_name]}", className="badge rounded-pill"),
+                    html.Span(f"{wins}", className="badge rounded-pill"),
                 ],
             )
-            for i, row in wins_df.iterrows()
+            for rank, (author_name, periods, wins) in enumerate(
+                zip(wins_df.index, wins_df["periods"], wins_df["wins"]), start=1
+            )
         ]
         return html.Ul(items, className="list-group list-group-flush")
 
+    @timed
     def create_daily_leaderboard(
-        dff: pd.DataFrame,
+        winners: dict,
         metric_selected: str,
         view_mode: str,
         start_date_utc: pd.Timestamp,
         end_date_utc: pd.Timestamp,
         color_map: dict,
     ) -> html.Div:
-        if dff.empty:
+        if not winners:
             return html.P("No data.", className="text-center p-3")
 
-        if metric_selected == "characters":
-            resampled = (
-                dff.groupby([dff["timestamp"].dt.to_period("D"), "author_name"])[
-                    "len_content"
-                ]
-                .sum()
-                .reset_index(name="value")
-            )
-        else:
-            resampled = (
-                dff.groupby([dff["timestamp"].dt.to_period("D"), "author_name"])
-                .size()
-                .reset_index(name="value")
-            )
-
-        if resampled.empty:
-            return html.P("Not enough data.", className="text-center p-3")
-
-        winners = resampled.loc[resampled.groupby("timestamp")["value"].idxmax()]
-
         if view_mode == "list":
-            wins_df = (
-                winners.groupby("author_name")["timestamp"].agg(list).reset_index()
+            return create_leaderboard(
+                winners, "D", "Days Won", "%d %B %Y", metric_selected
             )
-            wins_df["Days Won"] = wins_df["timestamp"].apply(len)
-            wins_df = wins_df.sort_values("Days Won", ascending=False).head(10)
 
-            items = [
-                html.Li(
-                    className="list-group-item d-flex justify-content-between align-items-center leaderboard-item",
-                    title=", ".join([d.strftime("%d %B %Y") for d in row["timestamp"]]),
-                    children=[
-                        html.Div(
-                            [
-                                html.Span(f"{i + 1}.", className="leaderboard-rank"),
-                                html.Span(row["author_name"]),
-                            ]
-                        ),
-                        html.Span(f"{row['Days Won']}", className="badge rounded-pill"),
-                    ],
-                )
-                for i, row in wins_df.iterrows()
-            ]
-            return html.Ul(items, className="list-group list-group-flush")
-
-        else:
-            winners["date"] = winners["timestamp"].dt.to_timestamp().dt.date
-            winner_map = winners.set_index("date")["author_name"].to_dict()
+        daily_winners = winners[("D", metric_selected)]
+        winner_map = dict(
+            zip(
+                pd.to_datetime(daily_winners["period"]).dt.date,
+                daily_winners["author_name"],
+            )
+        )
 
-            color_winner_map = {
-                date: color_map.get(name, "#6c757d")
-                for date, name in winner_map.items()
-            }
+        color_winner_map = {
+            date: color_map.get(name, "#6c757d") for date, name in winner_map.items()
+        }
 
-            return html.Div(
-                generate_calendars(
-                    start_date_utc, end_date_utc, winner_map, color_winner_map
-                ),
-                style={"maxHeight": "500px", "overflowY": "auto"},
-            )
+        return html.Div(
+            generate_calendars(
+                start_date_utc, end_date_utc, winner_map, color_winner_map
+            ),
+            style={"maxHeight": "500px", "overflowY": "auto"},
+        )
 
+    @timed
     def generate_calendars(
         start_date: pd.Timestamp,
         end_date: pd.Timestamp,
@@ -1204,6 +1848,7 @@ def register_callbacks(
 
         return months
 
+    @timed
     def create_most_mentioned_graph(
         dff: pd.DataFrame,
         color_map: dict,
@@ -1334,20 +1979,19 @@ def register_callbacks(
         )
         return fig
 
+    @timed
     def create_top_reactions_list(
-        dff: pd.DataFrame, user_id_to_color_map: dict, current_member_ids_int: set
+        top_reacted: Optional[pd.DataFrame],
+        user_id_to_name_map: dict,
+        user_id_to_color_map: dict,
+        current_member_ids_int: set,
     ) -> html.Ul:
-        if dff.empty or "total_reaction_count" not in dff.columns:
+        if top_reacted is None:
             return html.P(
                 "No reaction data available for this period.",
                 className="text-center text-muted p-4",
             )
 
-        top_reacted = dff.sort_values(by="total_reaction_count", ascending=False).head(
-            10
-        )
-        top_reacted = top_reacted[top_reacted["total_reaction_count"] > 0]
-
         if top_reacted.empty:
             return html.P(
                 "No messages with reactions found.",
@@ -1365,7 +2009,9 @@ def register_callbacks(
                 else "#6c757d"
             )
 
-            message_content = row["content"]
+            message_content = row.get("content")
+            if not isinstance(message_content, str):
+                message_content = ""
             if len(message_content) > 200:
                 message_content = message_content[:200] + "..."
             if not message_content:
@@ -1391,7 +2037,7 @@ def register_callbacks(
                                 ),
                                 html.A(
                                     "Go to message",
-                                    href=row["jump_url"],
+                                    href=row.get("jump_url"),
                                     target="_blank",
                                     className="small text-muted",
                                 ),
@@ -0,0 +1,228 @@
+import copy
+import json
+import logging
+import os
+import threading
+from typing import Callable, Optional
+
+import pandas as pd
+
+from dataus.constant import FILTER_CACHE_MAX_BYTES, FILTER_CACHE_MAX_ENTRIES
+
+from .cachus import FrameCache, dataset_fingerprint, frame_fingerprint
+from .personus import PersonDirectory
+from .storus import MessageTextStore
+
+VIRGULE_ROLE_NAME = "Virgule du 4'"
+CALENDAR_COLUMNS = ["month_year", "hour_of_day", "weekday", "month_name", "year"]
+
+
+def add_calendar_columns(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        for col in CALENDAR_COLUMNS:
+            df[col] = pd.NA
+        return df
+    local_ts = df["timestamp"].dt.tz_convert("Europe/Paris")
+    month_codes, months = pd.factorize(local_ts.dt.to_period("M"))
+    df["month_year"] = months.astype(str).to_numpy(dtype=object)[month_codes]
+    df["hour_of_day"] = local_ts.dt.hour
+    df["weekday"] = df["timestamp"].dt.day_name()
+    df["month_name"] = df["timestamp"].dt.month_name()
+    df["year"] = df["timestamp"].dt.year
+    return df
+
+
+class DashboardData:
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        server_data_map: dict,
+        mudae_channel_ids: list,
+        text_store: Optional[MessageTextStore] = None,
+    ) -> None:
+        self.text_store = text_store
+        self.mudae_ids_set = set(int(id_str) for id_str in mudae_channel_ids)
+        self.index_members(server_data_map)
+
+        if df["timestamp"].dt.tz is None:
+            df["timestamp"] = df["timestamp"].dt.tz_localize("UTC")
+        if not df["timestamp"].is_monotonic_increasing:
+            logging.warning("Message frame is not sorted by timestamp, sorting it now.")
+            df = df.sort_values("timestamp", kind="stable", ignore_index=True)
+        self.assign_people(df)
+        # Le jeu partagé entre workers les contient déjà, mappées et non recopiées
+        if not set(CALENDAR_COLUMNS).issubset(df.columns):
+            add_calendar_columns(df)
+
+        self.df = df
+        # Édité ou re-réagi, un message garde son id : tout le contenu est haché
+        self.frame_version = frame_fingerprint(df)
+        self.version = dataset_fingerprint(self.frame_version, server_data_map)
+        self.frame_cache = FrameCache(FILTER_CACHE_MAX_ENTRIES, FILTER_CACHE_MAX_BYTES)
+
+    def index_members(self, server_data_map: dict) -> None:
+        self.server_data_map = server_data_map
+        author_map = server_data_map.get("members", {})
+        role_map = server_data_map.get("roles", {})
+
+        self.user_id_to_name_map = {int(k): v["name"] for k, v in author_map.items()}
+        self.user_id_to_original_name_map = {
+            int(k): v["original_name"] for k, v in author_map.items()
+        }
+        self.name_to_user_id_map = {v["name"]: int(k) for k, v in author_map.items()}
+        self.user_id_to_color_map = {
+            k: v["top_role_color"] for k, v in author_map.items()
+        }
+        self.role_names_map = {k: v["name"] for k, v in role_map.items()}
+
+        virgule_role_ids = {
+            id for id, data in role_map.items() if data["name"] == VIRGULE_ROLE_NAME
+        }
+
+        self.virgule_author_ids = set()
+        self.non_virgule_author_ids = set()
+        self.current_member_ids_int = set()
+
+        for uid, data in author_map.items():
+            user_id_int = int(uid)
+            self.current_member_ids_int.add(user_id_int)
+            user_roles = set(str(r) for r in data.get("roles", []))
+
+            if not virgule_role_ids.isdisjoint(user_roles):
+                self.virgule_author_ids.add(user_id_int)
+            else:
+                self.non_virgule_author_ids.add(user_id_int)
+
+        self.people = PersonDirectory(author_map)
+
+    def assign_people(self, df: pd.DataFrame) -> None:
+        # Les noms ne sont qu'un libellé des codes person_id, jamais une clé de groupby
+        person_ids = self.people.codes(df["author_id"])
+        df["person_id"] = person_ids
+        df["author_name"] = self.people.labels(person_ids)
+
+    def rekey(self, server_data_map: dict) -> "DashboardData":
+        # Seuls les membres ont changé : le tri et les colonnes dérivées sont repris
+        data = copy.copy(self)
+        data.index_members(server_data_map)
+        data.df = self.df.copy(deep=False)
+        data.assign_people(data.df)
+        # Le contenu n'a pas bougé : son empreinte est reprise, pas recalculée
+        data.version = dataset_fingerprint(self.frame_version, server_data_map)
+        data.frame_cache = FrameCache(FILTER_CACHE_MAX_ENTRIES, FILTER_CACHE_MAX_BYTES)
+        return data
+
+
+def file_signature(paths: list) -> tuple:
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+class DatasetStore:
+    def __init__(
+        self,
+        data: DashboardData,
+        loader: Optional[Callable[[], DashboardData]] = None,
+        watch_paths: Optional[list] = None,
+        server_data_path: Optional[str] = None,
+    ) -> None:
+        self._data = data
+        self.loader = loader
+        self.watch_paths = list(watch_paths or [])
+        self.server_data_path = server_data_path
+        self._load_listeners: list = []
+        self._swap_listeners: list = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._signature = file_signature(self.watch_paths)
+
+    @property
+    def current(self) -> DashboardData:
+        return self._data
+
+    def on_load(self, listener: Callable[[DashboardData], None]) -> None:
+        self._load_listeners.append(listener)
+
+    def on_swap(self, listener: Callable[[DashboardData], None]) -> None:
+        self._swap_listeners.append(listener)
+
+    def swap(self, data: DashboardData) -> None:
+        with self._lock:
+            previous, self._data = self._data, data
+        logging.info(
+            f"Dashboard dataset swapped from {previous.version} to {data.version} "
+            f"({len(data.df)} messages)."
+        )
+        for listener in self._swap_listeners:
+            listener(data)
+
+    def reload(self) -> bool:
+        if self.loader is None:
+            return False
+        return self._install(self.loader())
+
+    def rekey(self) -> bool:
+        if self.server_data_path is None:
+            return False
+        with open(self.server_data_path, encoding="utf-8") as f:
+            server_data_map = json.load(f)
+        logging.info("Only server data changed, re-keying the loaded messages.")
+        return self._install(self._data.rekey(server_data_map))
+
+    def _install(self, data: DashboardData) -> bool:
+        if data.version == self._data.version:
+            logging.info("Dataset files changed but content is identical, keeping it.")
+            return False
+        # Les index et filtres par défaut sont prêts avant que les callbacks ne voient le nouveau jeu
+        for listener in self._load_listeners:
+            listener(data)
+        self.swap(data)
+        return True
+
+    def changed_paths(self, signature: tuple) -> set:
+        return {
+            current[0]
+            for previous, current in zip(self._signature, signature)
+            if previous != current
+        }
+
+    def start_polling(self, interval: float) -> None:
+        if self.loader is None or not self.watch_paths or interval <= 0:
+            return
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._poll, args=(interval,), name="dataset-reload", daemon=True
+        )
+        self._thread.start()
+
+    def stop_polling(self) -> None:
+        self._stop.set()
+
+    def _poll(self, interval: float) -> None:
+        pending = None
+        while not self._stop.wait(interval):
+            signature = file_signature(self.watch_paths)
+            if signature == self._signature:
+                pending = None
+                continue
+            # On attend que les fichiers ne bougent plus avant de les relire
+            if signature != pending:
+                pending = signature
+                continue
+            try:
+                if self.changed_paths(signature) == {self.server_data_path}:
+                    self.rekey()
+                else:
+                    self.reload()
+            except Exception as e:
+                logging.warning(f"Could not reload the dashboard dataset: {e}")
+            self._signature = signature
+            pending = None
@@ -0,0 +1,156 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .indexus import covered_groups, group_starts, timestamps_to_int64
+
+# Longueurs comptées seau par seau en dessous, gardées une à une au-dessus
+LENGTH_HISTOGRAM_BUCKETS = 512
+
+
+def weighted_quantiles(
+    groups: np.ndarray, values: np.ndarray, counts: np.ndarray, q: float
+) -> tuple[np.ndarray, np.ndarray]:
+    order = np.lexsort((values, groups))
+    groups, values, counts = groups[order], values[order], counts[order]
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    ends = np.r_[starts[1:], len(groups)]
+    cumulative = np.cumsum(counts)
+    before = np.r_[0, cumulative][starts]
+    totals = cumulative[ends - 1] - before
+
+    # Interpolation linéaire entre les deux rangs voisins, comme pandas
+    position = q * (totals - 1)
+    low_rank = np.floor(position).astype("int64")
+    high_rank = np.ceil(position).astype("int64")
+    low = values[np.searchsorted(cumulative, before + low_rank, side="right")]
+    high = values[np.searchsorted(cumulative, before + high_rank, side="right")]
+    return groups[starts], low + (high - low) * (position - low_rank)
+
+
+class LengthHistogram:
+    def __init__(self, frame: pd.DataFrame, names: pd.Index) -> None:
+        lengths = frame["len_content"].to_numpy(dtype="float64")
+        people = frame["person_id"].to_numpy()
+        self.names = names
+        months = (
+            timestamps_to_int64(frame["timestamp"])
+            .view("datetime64[ns]")
+            .astype("datetime64[M]")
+            .view("i8")
+        )
+        self.month_starts = group_starts(months)
+        month_rows = np.repeat(
+            np.arange(len(self.month_starts) - 1), np.diff(self.month_starts)
+        )
+
+        # Les lignes restent accessibles pour les mois coupés par la fenêtre
+        valid = ~np.isnan(lengths)
+        self.row_lengths = np.where(valid, lengths, -1).astype("int32")
+        self.row_people = people.astype("int32")
+
+        small = valid & (lengths < LENGTH_HISTOGRAM_BUCKETS)
+        histogram = (
+            pd.DataFrame(
+                {
+                    "month": month_rows[small],
+                    "person": people[small],
+                    "length": self.row_lengths[small],
+                }
+            )
+            .groupby(["month", "person", "length"], sort=True)
+            .size()
+            .reset_index(name="count")
+        )
+        self.histogram_months = histogram["month"].to_numpy()
+        self.histogram_people = histogram["person"].to_numpy()
+        self.histogram_lengths = histogram["length"].to_numpy()
+        self.histogram_counts = histogram["count"].to_numpy()
+
+        # Débordement : les messages longs, rares, gardés tels quels
+        overflow = np.flatnonzero(valid & ~small)
+        self.overflow_months = month_rows[overflow]
+        self.overflow_people = people[overflow]
+        self.overflow_lengths = self.row_lengths[overflow]
+
+    @property
+    def nbytes(self) -> int:
+        return int(
+            sum(
+                array.nbytes
+                for array in [
+                    self.month_starts,
+                    self.row_lengths,
+                    self.row_people,
+                    self.histogram_months,
+                    self.histogram_people,
+                    self.histogram_lengths,
+                    self.histogram_counts,
+                    self.overflow_months,
+                    self.overflow_people,
+                    self.overflow_lengths,
+                ]
+            )
+        )
+
+    def _window(self, lo: int, hi: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        first, last, full_lo, full_hi = covered_groups(self.month_starts, lo, hi)
+
+        # Mois complets : histogrammes sommés ; mois partiels : lecture directe
+        h_lo, h_hi = np.searchsorted(self.histogram_months, [first, last])
+        o_lo, o_hi = np.searchsorted(self.overflow_months, [first, last])
+        edges = np.r_[np.arange(lo, full_lo), np.arange(full_hi, hi)].astype(np.intp)
+        edges = edges[self.row_lengths[edges] >= 0]
+        people = np.concatenate(
+            [
+                self.histogram_people[h_lo:h_hi],
+                self.overflow_people[o_lo:o_hi],
+                self.row_people[edges],
+            ]
+        )
+        lengths = np.concatenate(
+            [
+                self.histogram_lengths[h_lo:h_hi],
+                self.overflow_lengths[o_lo:o_hi],
+                self.row_lengths[edges],
+            ]
+        )
+        counts = np.concatenate(
+            [
+                self.histogram_counts[h_lo:h_hi],
+                np.ones(o_hi - o_lo + len(edges), dtype="int64"),
+            ]
+        )
+        return people, lengths, counts
+
+    def quantiles(
+        self, lo: int, hi: int, q: float, names: Optional[Iterable[str]] = None
+    ) -> pd.Series:
+        groups, lengths, counts = self._window(lo, hi)
+        if names is not None:
+            codes = self.names.get_indexer(list(names))
+            keep = np.isin(groups, codes[codes >= 0])
+            groups, lengths, counts = groups[keep], lengths[keep], counts[keep]
+        if not len(counts):
+            return pd.Series(dtype="float64")
+        groups, values = weighted_quantiles(groups, lengths, counts, q)
+        return pd.Series(values, index=self.names[groups])
+
+    def medians(
+        self, lo: int, hi: int, names: Optional[Iterable[str]] = None
+    ) -> pd.Series:
+        return self.quantiles(lo, hi, 0.5, names)
+
+    def overall_quantile(self, lo: int, hi: int, q: float) -> float:
+        _, lengths, counts = self._window(lo, hi)
+        if not len(counts):
+            return float("nan")
+        _, values = weighted_quantiles(
+            np.zeros(len(counts), dtype="int64"), lengths, counts, q
+        )
+        return float(values[0])
+
+    def active_members(self, lo: int, hi: int) -> int:
+        people, _, _ = self._window(lo, hi)
+        return int(len(np.unique(people)))
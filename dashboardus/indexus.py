@@ -0,0 +1,110 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+NANOSECONDS_PER_DAY = 86_400 * 1_000_000_000
+
+
+def timestamps_to_int64(timestamps: pd.Series) -> np.ndarray:
+    return timestamps.to_numpy(dtype="datetime64[ns]").view("i8")
+
+
+def group_starts(keys: np.ndarray) -> np.ndarray:
+    # Début de chaque groupe de clés triées, avec une sentinelle en fin
+    n = len(keys)
+    return np.append(
+        np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if n else [], n
+    ).astype(np.intp)
+
+
+def covered_groups(starts: np.ndarray, lo: int, hi: int) -> tuple[int, int, int, int]:
+    # Groupes entièrement compris dans [lo, hi), et les lignes qu'ils occupent
+    first = int(np.searchsorted(starts, lo, side="left"))
+    last = max(first, int(np.searchsorted(starts, hi, side="right")) - 1)
+    return first, last, min(int(starts[first]), hi), min(int(starts[last]), hi)
+
+
+class RowSelection:
+    def __init__(self, frame: pd.DataFrame, rows: Optional[np.ndarray] = None) -> None:
+        # Des positions dans le jeu chargé : ses colonnes mappées ne sont pas copiées
+        self.frame = frame
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.frame) if self.rows is None else len(self.rows)
+
+    @property
+    def empty(self) -> bool:
+        return len(self) == 0
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self.rows is None else int(self.rows.nbytes)
+
+    def take(self, positions) -> pd.DataFrame:
+        if self.rows is None:
+            return self.frame.iloc[positions]
+        return self.frame.iloc[self.rows[positions]]
+
+    def window(self, lo: int, hi: int) -> pd.DataFrame:
+        # Sans filtre, une simple vue ; sinon une copie limitée à la fenêtre
+        return self.take(slice(lo, hi))
+
+    def columns(self, columns: list) -> pd.DataFrame:
+        frame = self.frame[columns]
+        return frame if self.rows is None else frame.iloc[self.rows]
+
+    def values(self, column: str, lo: int = 0, hi: Optional[int] = None) -> np.ndarray:
+        values = self.frame[column].to_numpy()
+        if self.rows is None:
+            return values[lo:hi]
+        return values[self.rows[lo:hi]]
+
+
+class TimeRangeIndex:
+    def __init__(self, frame: pd.DataFrame, author_col: str = "person_id") -> None:
+        self._values = timestamps_to_int64(frame["timestamp"])
+        if len(self._values) > 1 and np.any(np.diff(self._values) < 0):
+            raise ValueError("TimeRangeIndex requires a frame sorted by timestamp.")
+        self._authors = frame[author_col]
+        self._author_positions: Optional[dict] = None
+
+    @property
+    def nbytes(self) -> int:
+        # Positions par auteur, construites à la demande : une par ligne
+        positions = len(self._values) * np.dtype(np.intp).itemsize
+        return int(
+            self._values.nbytes
+            + self._authors.memory_usage(index=True, deep=True)
+            + positions
+        )
+
+    def bounds(self, start: pd.Timestamp, end: pd.Timestamp) -> tuple[int, int]:
+        lo = int(np.searchsorted(self._values, pd.Timestamp(start).value, side="left"))
+        hi = int(np.searchsorted(self._values, pd.Timestamp(end).value, side="right"))
+        return lo, max(lo, hi)
+
+    def slice(
+        self, frame: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp
+    ) -> pd.DataFrame:
+        lo, hi = self.bounds(start, end)
+        return frame.iloc[lo:hi]
+
+    def author_rows(self, authors: Iterable, lo: int, hi: int) -> np.ndarray:
+        if self._author_positions is None:
+            self._author_positions = self._authors.groupby(
+                self._authors, sort=False
+            ).indices
+
+        chunks = []
+        for author in authors:
+            positions = self._author_positions.get(author)
+            if positions is None:
+                continue
+            first, last = np.searchsorted(positions, [lo, hi])
+            chunks.append(positions[first:last])
+
+        if not chunks:
+            return np.empty(0, dtype=np.intp)
+        return np.sort(np.concatenate(chunks)) - lo
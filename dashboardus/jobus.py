@@ -0,0 +1,136 @@
+import logging
+import os
+import threading
+import traceback
+import uuid
+from contextvars import copy_context
+
+from dash._callback_context import context_value
+from dash._utils import AttributeDict
+from dash.exceptions import PreventUpdate
+from dash.long_callback.managers import BaseLongCallbackManager
+
+JOB_FLAG_EXPIRE_SECONDS = 3600
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class ThreadJobManager(BaseLongCallbackManager):
+    def __init__(self, cache_dir: str, expire: int = JOB_FLAG_EXPIRE_SECONDS) -> None:
+        try:
+            import diskcache
+        except ImportError as e:
+            raise ImportError(
+                "Background callbacks require diskcache: pip install -e .[background]"
+            ) from e
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.handle = diskcache.Cache(cache_dir)
+        self.expire = expire
+        super().__init__(None)
+
+    @staticmethod
+    def _running_key(job: str) -> str:
+        return f"job-{job}-running"
+
+    @staticmethod
+    def _cancel_key(job: str) -> str:
+        return f"job-{job}-cancelled"
+
+    def terminate_job(self, job) -> None:
+        if not job:
+            return
+        if self.handle.get(self._running_key(job)):
+            self.handle.set(self._cancel_key(job), True, expire=self.expire)
+
+    def terminate_unhealthy_job(self, job) -> bool:
+        return False
+
+    def job_running(self, job) -> bool:
+        return bool(job) and bool(self.handle.get(self._running_key(job)))
+
+    def make_job_fn(self, fn, progress, key=None):
+        handle = self.handle
+        expire = self.expire
+        running_key = self._running_key
+        cancel_key = self._cancel_key
+
+        def job_fn(job, result_key, progress_key, user_callback_args, context):
+            def set_progress(progress_value):
+                if handle.get(cancel_key(job)):
+                    raise JobCancelled()
+                if not isinstance(progress_value, (list, tuple)):
+                    progress_value = [progress_value]
+                handle.set(progress_key, progress_value, expire=expire)
+
+            maybe_progress = [set_progress] if progress else []
+
+            def run():
+                c = AttributeDict(**context)
+                c.ignore_register_page = False
+                c.updated_props = {}
+                context_value.set(c)
+                try:
+                    if isinstance(user_callback_args, dict):
+                        output = fn(*maybe_progress, **user_callback_args)
+                    elif isinstance(user_callback_args, (list, tuple)):
+                        output = fn(*maybe_progress, *user_callback_args)
+                    else:
+                        output = fn(*maybe_progress, user_callback_args)
+                except JobCancelled:
+                    logging.debug(f"Background job {job} cancelled.")
+                except PreventUpdate:
+                    handle.set(result_key, {"_dash_no_update": "_dash_no_update"})
+                except Exception as err:
+                    handle.set(
+                        result_key,
+                        {
+                            "long_callback_error": {
+                                "msg": str(err),
+                                "tb": traceback.format_exc(),
+                            }
+                        },
+                    )
+                else:
+                    handle.set(result_key, output, expire=expire)
+                finally:
+                    handle.delete(running_key(job))
+                    handle.delete(cancel_key(job))
+
+            copy_context().run(run)
+
+        return job_fn
+
+    def call_job_fn(self, key, job_fn, args, context) -> str:
+        job = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+        self.handle.set(self._running_key(job), True, expire=self.expire)
+        thread = threading.Thread(
+            target=job_fn,
+            args=(job, key, self._make_progress_key(key), args, context),
+            daemon=True,
+        )
+        thread.start()
+        return job
+
+    def get_progress(self, key):
+        progress_key = self._make_progress_key(key)
+        progress_data = self.handle.get(progress_key)
+        if progress_data:
+            self.handle.delete(progress_key)
+        return progress_data
+
+    def result_ready(self, key) -> bool:
+        return self.handle.get(key) is not None
+
+    def get_result(self, key, job):
+        result = self.handle.get(key, self.UNDEFINED)
+        if result is self.UNDEFINED:
+            return self.UNDEFINED
+        self.handle.delete(key)
+        self.handle.delete(self._make_progress_key(key))
+        return result
+
+    def get_updated_props(self, key) -> dict:
+        return {}
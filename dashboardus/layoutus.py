@@ -4,7 +4,14 @@ import dash_bootstrap_components as dbc
 import pandas as pd
 from dash import dcc, html
 
-from .callbackus import CONTENT_STYLE_FULL, HEADER_STYLE_FULL, SIDEBAR_HIDDEN
+from .callbackus import (
+    CONTENT_STYLE,
+    CONTENT_STYLE_FULL,
+    HEADER_STYLE,
+    HEADER_STYLE_FULL,
+    SIDEBAR_HIDDEN,
+    SIDEBAR_STYLE,
+)
 
 
 def create_layout(df: pd.DataFrame) -> html.Div:
@@ -206,6 +213,33 @@ def create_layout(df: pd.DataFrame) -> html.Div:
     content = html.Div(
         [
             dcc.Store(id="sidebar-state-store", data=False),
+            dcc.Store(id="rendered-panels-store", data={}),
+            dcc.Store(
+                id="sidebar-styles-store",
+                data={
+                    "open": {
+                        "sidebar": SIDEBAR_STYLE,
+                        "content": CONTENT_STYLE,
+                        "header": HEADER_STYLE,
+                    },
+                    "closed": {
+                        "sidebar": SIDEBAR_HIDDEN,
+                        "content": CONTENT_STYLE_FULL,
+                        "header": HEADER_STYLE_FULL,
+                    },
+                },
+            ),
+            html.Div(
+                dbc.Progress(
+                    id="update-progress",
+                    value=0,
+                    striped=True,
+                    animated=True,
+                    className="mb-3",
+                ),
+                id="update-progress-container",
+                style={"display": "none"},
+            ),
             dcc.Markdown(id="dynamic-styles", style={"display": "none"}),
             html.Div(id="user-profile-card-container"),
             html.Div(
@@ -241,7 +275,7 @@ def create_layout(df: pd.DataFrame) -> html.Div:
                                     ], width=2),
                                 ]),
                                 dcc.Loading(
-                                    html.Div(id="evolution-container")
+                                    create_panel_containers("evolution")
                                 ),
                             ]
                         ),
@@ -266,6 +300,7 @@ def create_layout(df: pd.DataFrame) -> html.Div:
                                                 {"label": "Day of Week", "value": "weekday"},
                                                 {"label": "Month", "value": "month"},
                                                 {"label": "Year", "value": "year"},
+                                                {"label": "Week Heatmap", "value": "weekday_hour"},
                                             ],
                                             value="hour",
                                             inline=True,
@@ -285,7 +320,7 @@ def create_layout(df: pd.DataFrame) -> html.Div:
                                         ),
                                     ], width=2),
                                 ]),
-                                dcc.Loading(html.Div(id="distribution-container")),
+                                dcc.Loading(create_panel_containers("distribution")),
                             ]
                         ),
                         className="shadow-sm mb-4",
@@ -317,7 +352,7 @@ def create_layout(df: pd.DataFrame) -> html.Div:
                                                 ], width=4),
                                             ]),
                                             dcc.Loading(
-                                                html.Div(id="median-length-container")
+                                                create_panel_containers("median-length")
                                             ),
                                         ]
                                     ),
@@ -351,7 +386,7 @@ def create_layout(df: pd.DataFrame) -> html.Div:
                                                 ], width=4),
                                             ]),
                                             dcc.Loading(
-                                                html.Div(id="mentioned-users-container")
+                                                create_panel_containers("mentioned-users")
                                             ),
                                         ]
                                     ),
@@ -515,3 +550,15 @@ def create_leaderboard_card(title: str, container_id: str) -> dbc.Card:
         ],
         className="shadow-sm h-100",
     )
+
+
+def create_panel_containers(panel: str) -> html.Div:
+    return html.Div(
+        [
+            html.Div(
+                dcc.Graph(id=f"{panel}-graph", style={"height": "600px"}),
+                id=f"{panel}-container",
+            ),
+            html.Div(id=f"{panel}-table-container", style={"display": "none"}),
+        ]
+    )
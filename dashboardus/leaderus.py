@@ -0,0 +1,171 @@
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .indexus import NANOSECONDS_PER_DAY, timestamps_to_int64
+from .personus import PersonDirectory
+
+METRICS = ["messages", "characters"]
+
+
+class DailyActivity:
+    def __init__(
+        self,
+        days: np.ndarray,
+        author_ids: np.ndarray,
+        mudae: np.ndarray,
+        messages: np.ndarray,
+        characters: np.ndarray,
+        rows: int,
+    ) -> None:
+        self.days = days
+        self.author_ids = author_ids
+        self.mudae = mudae
+        self.messages = messages
+        self.characters = characters
+        self.rows = rows
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            array.nbytes
+            for array in [
+                self.days,
+                self.author_ids,
+                self.mudae,
+                self.messages,
+                self.characters,
+            ]
+        )
+
+    @property
+    def last_day(self) -> Optional[int]:
+        return int(self.days[-1]) if len(self.days) else None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, mudae_ids: set) -> "DailyActivity":
+        if df.empty:
+            empty = np.empty(0, dtype="int64")
+            return cls(empty, empty, empty.astype(bool), empty, empty, 0)
+
+        # Agrégat (jour UTC, auteur, salon mudae) : une seule passe sur les messages
+        aggregate = (
+            pd.DataFrame(
+                {
+                    "day": timestamps_to_int64(df["timestamp"]) // NANOSECONDS_PER_DAY,
+                    "author_id": df["author_id"].to_numpy(),
+                    "mudae": df["channel_id"].isin(mudae_ids).to_numpy(),
+                    "characters": df["len_content"].to_numpy(),
+                }
+            )
+            .groupby(["day", "author_id", "mudae"], sort=True)["characters"]
+            .agg(["size", "sum"])
+            .reset_index()
+        )
+        return cls(
+            aggregate["day"].to_numpy(),
+            aggregate["author_id"].to_numpy(),
+            aggregate["mudae"].to_numpy(),
+            aggregate["size"].to_numpy(),
+            aggregate["sum"].to_numpy(),
+            len(df),
+        )
+
+    def extend(self, df: pd.DataFrame, mudae_ids: set) -> "DailyActivity":
+        cutoff = self.last_day
+        if cutoff is None:
+            return DailyActivity.from_frame(df, mudae_ids)
+
+        # Le dernier jour connu est recalculé, les précédents doivent être inchangés
+        boundary = int(
+            np.searchsorted(
+                timestamps_to_int64(df["timestamp"]), cutoff * NANOSECONDS_PER_DAY
+            )
+        )
+        kept = int(np.searchsorted(self.days, cutoff))
+        unchanged = boundary == int(self.messages[:kept].sum()) and int(
+            df["len_content"].iloc[:boundary].sum()
+        ) == int(self.characters[:kept].sum())
+        if not unchanged:
+            logging.info("Past activity changed, rebuilding daily activity.")
+            return DailyActivity.from_frame(df, mudae_ids)
+
+        tail = DailyActivity.from_frame(df.iloc[boundary:], mudae_ids)
+        return DailyActivity(
+            np.concatenate([self.days[:kept], tail.days]),
+            np.concatenate([self.author_ids[:kept], tail.author_ids]),
+            np.concatenate([self.mudae[:kept], tail.mudae]),
+            np.concatenate([self.messages[:kept], tail.messages]),
+            np.concatenate([self.characters[:kept], tail.characters]),
+            boundary + tail.rows,
+        )
+
+    def window(
+        self,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        include_mudae: bool,
+        people: PersonDirectory,
+        allowed_author_ids: Optional[set] = None,
+    ) -> pd.DataFrame:
+        lo = int(np.searchsorted(self.days, start.value // NANOSECONDS_PER_DAY))
+        hi = int(
+            np.searchsorted(self.days, end.value // NANOSECONDS_PER_DAY, side="right")
+        )
+        frame = pd.DataFrame(
+            {
+                "day": self.days[lo:hi],
+                "person_id": people.codes(self.author_ids[lo:hi]),
+                "messages": self.messages[lo:hi],
+                "characters": self.characters[lo:hi],
+            }
+        )
+        mask = frame["person_id"].to_numpy() >= 0
+        if not include_mudae:
+            mask &= ~self.mudae[lo:hi]
+        if allowed_author_ids is not None:
+            mask &= np.isin(self.author_ids[lo:hi], list(allowed_author_ids))
+        return frame[mask]
+
+
+def period_winners(activity: pd.DataFrame, names: pd.Index) -> dict:
+    if activity.empty:
+        return {}
+
+    days = activity["day"].to_numpy().astype("datetime64[D]")
+    periods = {
+        "D": days,
+        "M": days.astype("datetime64[M]"),
+    }
+
+    winners = {}
+    for period, keys in periods.items():
+        totals = (
+            activity[METRICS]
+            .assign(period=keys, person_id=activity["person_id"].to_numpy())
+            .groupby(["period", "person_id"], sort=True)[METRICS]
+            .sum()
+            .reset_index()
+        )
+        for metric in METRICS:
+            # Égalité : le premier auteur par ordre alphabétique (ordre des codes) gagne
+            order = np.lexsort(
+                (-totals[metric].to_numpy(), totals["period"].to_numpy())
+            )
+            ranked = totals.iloc[order]
+            first = ranked.drop_duplicates("period", keep="first")
+            winners[(period, metric)] = pd.DataFrame(
+                {
+                    "period": first["period"].to_numpy(),
+                    "author_name": names[first["person_id"].to_numpy()].to_numpy(),
+                }
+            )
+    return winners
+
+
+def standings(winners: pd.DataFrame, limit: int = 10) -> pd.DataFrame:
+    grouped = winners.groupby("author_name", sort=True)["period"]
+    table = pd.DataFrame({"periods": grouped.agg(list), "wins": grouped.size()})
+    return table.sort_values("wins", ascending=False, kind="stable").head(limit)
@@ -0,0 +1,235 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from typing import Callable, Optional
+
+import flask
+import numpy as np
+
+METRICS_WINDOW = 512
+PROFILE_HISTORY = 20
+PROFILE_INTERVAL_SECONDS = 0.005
+PROFILE_COOKIE = "dash_profile"
+
+
+class MetricsRegistry:
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        self.window = window
+        self._durations: dict = defaultdict(lambda: deque(maxlen=self.window))
+        self._payloads: dict = defaultdict(lambda: deque(maxlen=self.window))
+        self._counts: Counter = Counter()
+        self._totals: Counter = Counter()
+        self._gauges: dict = {}
+        self._profiles: deque = deque(maxlen=PROFILE_HISTORY)
+        self._lock = threading.Lock()
+
+    def record(
+        self, kind: str, name: str, seconds: float, nbytes: Optional[int] = None
+    ) -> None:
+        key = (kind, name)
+        with self._lock:
+            self._counts[key] += 1
+            self._totals[key] += seconds
+            self._durations[key].append(seconds)
+            if nbytes is not None:
+                self._payloads[key].append(nbytes)
+
+    def register_gauge(self, name: str, getter: Callable[[], float]) -> None:
+        self._gauges[name] = getter
+
+    def add_profile(self, name: str, seconds: float, samples: Counter) -> None:
+        with self._lock:
+            self._profiles.append(
+                {
+                    "name": name,
+                    "time": time.time(),
+                    "duration_ms": seconds * 1000,
+                    "samples": samples,
+                }
+            )
+
+    def profiles(self) -> list:
+        with self._lock:
+            return list(self._profiles)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            keys = list(self._counts)
+            durations = {key: np.array(self._durations[key]) for key in keys}
+            payloads = {key: np.array(self._payloads[key]) for key in keys}
+            counts = dict(self._counts)
+            totals = dict(self._totals)
+
+        result: dict = defaultdict(dict)
+        for kind, name in sorted(keys):
+            recent = durations[(kind, name)] * 1000
+            entry = {
+                "count": counts[(kind, name)],
+                "total_ms": round(totals[(kind, name)] * 1000, 2),
+                "mean_ms": round(float(recent.mean()), 2),
+                "p50_ms": round(float(np.percentile(recent, 50)), 2),
+                "p95_ms": round(float(np.percentile(recent, 95)), 2),
+                "max_ms": round(float(recent.max()), 2),
+            }
+            sizes = payloads[(kind, name)]
+            if sizes.size:
+                entry["mean_bytes"] = int(sizes.mean())
+                entry["max_bytes"] = int(sizes.max())
+            result[kind][name] = entry
+
+        gauges = {}
+        for name, getter in self._gauges.items():
+            try:
+                gauges[name] = getter()
+            except Exception as e:
+                gauges[name] = f"error: {e}"
+        result["gauges"] = gauges
+        return dict(result)
+
+
+metrics = MetricsRegistry()
+
+
+def timed(func: Callable) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.record("builders", func.__name__, time.perf_counter() - start)
+
+    return wrapper
+
+
+class SamplingProfiler:
+    def __init__(
+        self, thread_id: int, interval: float = PROFILE_INTERVAL_SECONDS
+    ) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> "SamplingProfiler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+                )
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def callback_name(payload: Optional[dict]) -> str:
+    if not payload:
+        return "unknown"
+    outputs = payload.get("output", "").strip(".").split("...")
+    name = outputs[0]
+    if len(outputs) > 1:
+        name = f"{name} (+{len(outputs) - 1})"
+    return name
+
+
+def summarize_samples(samples: Counter, limit: int = 25) -> list:
+    inclusive: Counter = Counter()
+    own: Counter = Counter()
+    for stack, count in samples.items():
+        frames = stack.split(";")
+        for frame in set(frame.rsplit(":", 1)[0] for frame in frames):
+            inclusive[frame] += count
+        own[frames[-1].rsplit(":", 1)[0]] += count
+    return [
+        (frame, count, own.get(frame, 0)) for frame, count in inclusive.most_common(limit)
+    ]
+
+
+def format_profiles(profiles: list, folded: bool = False) -> str:
+    lines = []
+    for profile in reversed(profiles):
+        samples = profile["samples"]
+        total = sum(samples.values())
+        lines.append(
+            f"# {profile['name']} - {profile['duration_ms']:.1f} ms, {total} samples"
+        )
+        if folded:
+            lines.extend(f"{stack} {count}" for stack, count in samples.items())
+        else:
+            lines.append(f"{'total':>7} {'self':>7}  function")
+            for frame, count, own_count in summarize_samples(samples):
+                lines.append(
+                    f"{100 * count / total:6.1f}% {100 * own_count / total:6.1f}%  {frame}"
+                )
+        lines.append("")
+    return "\n".join(lines) or "No profile recorded yet.\n"
+
+
+def install_metrics(
+    app, profile_all: bool = False, profile_threshold_ms: float = 0.0
+) -> None:
+    server = app.server
+    update_path = app.config.requests_pathname_prefix + "_dash-update-component"
+
+    @server.before_request
+    def start_timer():
+        if flask.request.path != update_path:
+            return
+        flask.g.metrics_start = time.perf_counter()
+        if profile_all or flask.request.cookies.get(PROFILE_COOKIE) == "1":
+            flask.g.metrics_profiler = SamplingProfiler(threading.get_ident()).start()
+
+    @server.after_request
+    def stop_timer(response):
+        start = flask.g.pop("metrics_start", None)
+        if start is None:
+            return response
+        seconds = time.perf_counter() - start
+        name = callback_name(flask.request.get_json(silent=True))
+        nbytes = response.calculate_content_length()
+        metrics.record("callbacks", name, seconds, nbytes)
+
+        profiler = flask.g.pop("metrics_profiler", None)
+        if profiler is not None:
+            samples = profiler.stop()
+            if samples and seconds * 1000 >= profile_threshold_ms:
+                metrics.add_profile(name, seconds, samples)
+        return response
+
+    @server.route("/metrics")
+    def metrics_page():
+        return flask.Response(
+            json.dumps(metrics.snapshot(), indent=2), mimetype="application/json"
+        )
+
+    @server.route("/metrics/profiles")
+    def profiles_page():
+        response = flask.Response(
+            format_profiles(
+                metrics.profiles(), folded=flask.request.args.get("format") == "folded"
+            ),
+            mimetype="text/plain",
+        )
+        enable = flask.request.args.get("enable")
+        if enable == "1":
+            response.set_cookie(PROFILE_COOKIE, "1")
+        elif enable == "0":
+            response.delete_cookie(PROFILE_COOKIE)
+        return response
@@ -0,0 +1,65 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_PERSON_COLOR = "#6c757d"
+
+
+class PersonDirectory:
+    def __init__(self, members: dict) -> None:
+        account_ids = [int(k) for k in members]
+        # Un entier par nom affiché, dans l'ordre alphabétique : les alias fusionnent
+        codes, names = pd.factorize(
+            pd.Series([v["name"] for v in members.values()], dtype=object), sort=True
+        )
+        self.names = pd.Index(names, dtype=object)
+        self._accounts = pd.Index(account_ids, dtype="int64")
+        self._account_people = codes.astype("int32")
+
+        # Comme name_to_user_id_map, le dernier compte d'une personne fait foi
+        self.account_ids = np.zeros(len(self.names), dtype="int64")
+        self.account_ids[codes] = account_ids
+        self.colors = [DEFAULT_PERSON_COLOR] * len(self.names)
+        for code, member in zip(codes, members.values()):
+            self.colors[code] = member.get("top_role_color", DEFAULT_PERSON_COLOR)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def codes(self, author_ids) -> np.ndarray:
+        positions = self._accounts.get_indexer(np.asarray(author_ids, dtype="int64"))
+        return np.where(
+            positions >= 0, self._account_people[positions], -1
+        ).astype("int32")
+
+    def ids(self, names: Iterable[str]) -> list[int]:
+        positions = self.names.get_indexer(list(names))
+        return [int(position) for position in positions if position >= 0]
+
+    def labels(self, person_ids: np.ndarray) -> pd.Categorical:
+        return pd.Categorical.from_codes(person_ids, categories=self.names)
+
+    def color(self, name: str) -> str:
+        position = self.names.get_indexer([name])[0]
+        return self.colors[position] if position >= 0 else DEFAULT_PERSON_COLOR
+
+    def totals(
+        self, person_ids: np.ndarray, weights: Optional[np.ndarray] = None
+    ) -> pd.Series:
+        person_ids = np.asarray(person_ids)
+        known = person_ids[person_ids >= 0]
+        present = np.bincount(known, minlength=len(self.names)) > 0
+        counts = np.bincount(
+            known,
+            weights=None if weights is None else np.asarray(weights)[person_ids >= 0],
+            minlength=len(self.names),
+        ).astype("int64")
+        # Plus grand total d'abord, ordre alphabétique à égalité
+        order = np.argsort(-counts, kind="stable")
+        order = order[present[order]]
+        return pd.Series(
+            counts[order],
+            index=self.names[order].rename("author_name"),
+            name="count",
+        )
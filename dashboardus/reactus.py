@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+from .indexus import (
+    NANOSECONDS_PER_DAY,
+    covered_groups,
+    group_starts,
+    timestamps_to_int64,
+)
+
+
+def rank_rows(counts: np.ndarray, positions: np.ndarray, k: int) -> np.ndarray:
+    # Plus de réactions d'abord, puis le message le plus ancien à égalité
+    order = np.lexsort((positions, -counts))
+    return positions[order[:k]]
+
+
+class TopReactionIndex:
+    def __init__(self, frame: pd.DataFrame, k: int) -> None:
+        self.k = k
+        counts = frame["total_reaction_count"].to_numpy(dtype="int64")
+        days = timestamps_to_int64(frame["timestamp"]) // NANOSECONDS_PER_DAY
+        self.day_starts = group_starts(days)
+
+        positions = np.arange(len(counts))
+        order = np.lexsort((positions, -counts, days))
+        day_sizes = np.diff(self.day_starts)
+        rank = positions - np.repeat(self.day_starts[:-1], day_sizes)
+        keep = order[(rank < k) & (counts[order] > 0)]
+        self.candidates = np.sort(keep)
+        self.candidate_counts = counts[self.candidates]
+        self.counts = counts
+
+    @property
+    def nbytes(self) -> int:
+        return int(
+            self.day_starts.nbytes
+            + self.candidates.nbytes
+            + self.candidate_counts.nbytes
+            + self.counts.nbytes
+        )
+
+    def top(self, lo: int, hi: int) -> np.ndarray:
+        _, _, full_lo, full_hi = covered_groups(self.day_starts, lo, hi)
+
+        # Jours complets : leurs k meilleurs suffisent ; jours partiels : lecture directe
+        c_lo, c_hi = np.searchsorted(self.candidates, [full_lo, full_hi])
+        edges = np.r_[np.arange(lo, full_lo), np.arange(full_hi, hi)].astype(np.intp)
+        edges = edges[self.counts[edges] > 0]
+        positions = np.concatenate([self.candidates[c_lo:c_hi], edges])
+        counts = np.concatenate([self.candidate_counts[c_lo:c_hi], self.counts[edges]])
+        return rank_rows(counts, positions, self.k)
@@ -0,0 +1,143 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from dash import Patch
+
+WEBGL_DROPPED_PROPERTIES = ["type", "orientation"]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    bucket_size = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        # Point du bucket qui forme le plus grand triangle avec le précédent et la moyenne du suivant
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+    return indices
+
+
+def numeric_axis(values) -> Optional[np.ndarray]:
+    array = np.asarray(values)
+    if array.dtype.kind in "iuf":
+        return array.astype("float64")
+    if array.dtype.kind == "M":
+        return array.astype("datetime64[ns]").view("i8").astype("float64")
+    try:
+        return pd.to_datetime(array, utc=True).asi8.astype("float64")
+    except (ValueError, TypeError):
+        return None
+
+
+def axis_value(bound) -> float:
+    if isinstance(bound, (int, float)):
+        return float(bound)
+    timestamp = pd.Timestamp(bound)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return float(timestamp.value)
+
+
+def is_line_trace(trace) -> bool:
+    return (
+        trace.type in ("scatter", "scattergl")
+        and trace.x is not None
+        and trace.y is not None
+    )
+
+
+def needs_downsampling(fig: go.Figure, budget: int) -> bool:
+    return any(is_line_trace(trace) and len(trace.x) > budget for trace in fig.data)
+
+
+def trace_points(
+    trace, budget: int, x_range: Optional[tuple] = None
+) -> tuple[np.ndarray, np.ndarray]:
+    x_values = np.asarray(trace.x)
+    y_values = np.asarray(trace.y)
+    x_numeric = numeric_axis(x_values)
+    if x_numeric is None or np.any(np.diff(x_numeric) < 0):
+        return x_values, y_values
+
+    if x_range is not None:
+        # Un point de part et d'autre pour que les courbes touchent les bords
+        lo = max(int(np.searchsorted(x_numeric, x_range[0], side="left")) - 1, 0)
+        hi = int(np.searchsorted(x_numeric, x_range[1], side="right")) + 1
+        x_values, y_values, x_numeric = (
+            x_values[lo:hi],
+            y_values[lo:hi],
+            x_numeric[lo:hi],
+        )
+
+    keep = lttb_indices(
+        x_numeric - x_numeric[0] if len(x_numeric) else x_numeric,
+        y_values.astype("float64"),
+        budget,
+    )
+    return x_values[keep], y_values[keep]
+
+
+def downsample_figure(fig: go.Figure, budget: int, uirevision: str) -> go.Figure:
+    traces = []
+    for trace in fig.data:
+        if not is_line_trace(trace):
+            traces.append(trace)
+            continue
+        x_values, y_values = trace_points(trace, budget)
+        properties = trace.to_plotly_json()
+        for prop in WEBGL_DROPPED_PROPERTIES:
+            properties.pop(prop, None)
+        properties.update(x=x_values, y=y_values)
+        traces.append(go.Scattergl(properties))
+
+    downsampled = go.Figure(data=traces, layout=fig.layout)
+    downsampled.update_layout(uirevision=uirevision)
+    return downsampled
+
+
+def relayout_x_range(relayout_data: Optional[dict]):
+    if not relayout_data:
+        return None, False
+    if relayout_data.get("xaxis.autorange"):
+        return None, True
+    if "xaxis.range[0]" in relayout_data and "xaxis.range[1]" in relayout_data:
+        bounds = [relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"]]
+    elif "xaxis.range" in relayout_data:
+        bounds = relayout_data["xaxis.range"]
+    else:
+        return None, False
+
+    try:
+        numeric_bounds = [axis_value(bound) for bound in bounds]
+    except (ValueError, TypeError):
+        return None, False
+    return (numeric_bounds[0], numeric_bounds[1]), True
+
+
+def refine_patch(fig: go.Figure, budget: int, x_range: Optional[tuple]) -> Patch:
+    patch = Patch()
+    for i, trace in enumerate(fig.data):
+        if not is_line_trace(trace):
+            continue
+        x_values, y_values = trace_points(trace, budget, x_range)
+        patch["data"][i]["x"] = x_values
+        patch["data"][i]["y"] = y_values
+    return patch
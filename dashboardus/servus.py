@@ -0,0 +1,146 @@
+import json
+import logging
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from dataus.constant import (
+    BACKGROUND_JOBS_DIRNAME,
+    DATA_DIR,
+    DATASET_RELOAD_SECONDS,
+    MESSAGE_TEXT_FILENAME,
+    MUDAE_CHANNELS,
+    SERVER_DATA_FILENAME,
+    SHARED_DATASET_FILENAME,
+)
+
+from .appus import create_app
+from .datasetus import CALENDAR_COLUMNS, add_calendar_columns
+from .storus import MessageTextStore
+
+LIST_COLUMNS = ["mentions", "mentioned_role_ids", "reactions"]
+WORKER_THREADS = 4
+WORKER_TIMEOUT_SECONDS = 120
+
+
+def list_to_json(value) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return json.dumps([v.item() if hasattr(v, "item") else v for v in value])
+    return "[]"
+
+
+def write_shared_dataset(df: pd.DataFrame, path: str) -> None:
+    frame = df.copy()
+    # Colonnes dérivées écrites une fois plutôt que recalculées par chaque worker
+    if not set(CALENDAR_COLUMNS).issubset(frame.columns):
+        add_calendar_columns(frame)
+    if "content" in frame.columns:
+        frame["content"] = frame["content"].fillna("")
+    for col in LIST_COLUMNS:
+        if col in frame.columns:
+            frame[col] = frame[col].map(list_to_json)
+
+    arrays = {}
+    for col in frame.columns:
+        try:
+            arrays[col] = pa.array(frame[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays[col] = pa.array(
+                frame[col].map(lambda v: None if v is None or v is pd.NA else str(v)),
+                type=pa.string(),
+            )
+    table = pa.table(arrays)
+
+    # Fichier IPC non compressé pour que les workers puissent le mapper tel quel
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+    logging.info(
+        f"Wrote shared dataset to {path} ({os.path.getsize(path) / 1e6:.1f} MB)."
+    )
+
+
+def load_shared_dataset(path: str) -> pd.DataFrame:
+    source = pa.memory_map(path, "r")
+    table = pa.ipc.open_file(source).read_all()
+
+    # Les colonnes texte sans valeur manquante restent dans le fichier mappé
+    mapped_columns = [
+        name
+        for name, column in zip(table.column_names, table.columns)
+        if pa.types.is_string(column.type) and column.null_count == 0
+    ]
+    frame = table.drop_columns(mapped_columns).to_pandas(split_blocks=True)
+    for name in mapped_columns:
+        frame[name] = pd.arrays.ArrowExtensionArray(table[name])
+    return frame
+
+
+def create_server(
+    data_dir: str = DATA_DIR,
+    result_cache_dir: Optional[str] = None,
+    background_callbacks: bool = False,
+    profile_callbacks: bool = False,
+    reload_interval: float = DATASET_RELOAD_SECONDS,
+    approximate_stats: bool = False,
+):
+    dataset_path = os.path.join(data_dir, SHARED_DATASET_FILENAME)
+    server_data_path = os.path.join(data_dir, SERVER_DATA_FILENAME)
+
+    def load_dataset() -> tuple:
+        with open(server_data_path, encoding="utf-8") as f:
+            server_data = json.load(f)
+        return load_shared_dataset(dataset_path), server_data
+
+    df, server_data = load_dataset()
+
+    background_jobs_dir = (
+        os.path.join(data_dir, BACKGROUND_JOBS_DIRNAME)
+        if background_callbacks
+        else None
+    )
+    app = create_app(
+        df,
+        server_data,
+        MUDAE_CHANNELS,
+        result_cache_dir,
+        background_jobs_dir,
+        profile_callbacks,
+        load_dataset,
+        [dataset_path, server_data_path],
+        reload_interval,
+        MessageTextStore(os.path.join(data_dir, MESSAGE_TEXT_FILENAME)),
+        approximate_stats,
+        server_data_path,
+    )
+    logging.info(f"Worker {os.getpid()} serving {len(df)} messages.")
+    return app.server
+
+
+def serve(workers: int, bind: str, **server_options) -> None:
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError as e:
+        raise ImportError(
+            "Multi-worker serving requires gunicorn: pip install -e .[serve]"
+        ) from e
+
+    class DashboardApplication(BaseApplication):
+        def load_config(self) -> None:
+            self.cfg.set("bind", bind)
+            self.cfg.set("workers", workers)
+            self.cfg.set("threads", WORKER_THREADS)
+            self.cfg.set("timeout", WORKER_TIMEOUT_SECONDS)
+            self.cfg.set("preload_app", False)
+
+        def load(self):
+            return create_server(**server_options)
+
+    DashboardApplication().run()
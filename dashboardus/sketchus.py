@@ -0,0 +1,180 @@
+import math
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+from .histogramus import weighted_quantiles
+from .indexus import NANOSECONDS_PER_DAY, timestamps_to_int64
+
+# Longueurs exactes jusqu'à EXACT_LENGTHS, puis seaux logarithmiques à 1 % près
+EXACT_LENGTHS = 128
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+HLL_PRECISION = 11
+HLL_REGISTERS = 1 << HLL_PRECISION
+EXACT_DISTINCT_LIMIT = 1 << 16
+
+
+def frame_days(frame: pd.DataFrame) -> np.ndarray:
+    return timestamps_to_int64(frame["timestamp"]) // NANOSECONDS_PER_DAY
+
+
+def length_buckets(lengths: np.ndarray) -> np.ndarray:
+    buckets = lengths.astype("int64")
+    large = lengths > EXACT_LENGTHS
+    buckets[large] = EXACT_LENGTHS + np.ceil(
+        np.log(lengths[large] / EXACT_LENGTHS) / math.log(GAMMA)
+    ).astype("int64")
+    return buckets
+
+
+def bucket_values(buckets: np.ndarray) -> np.ndarray:
+    values = buckets.astype("float64")
+    large = buckets > EXACT_LENGTHS
+    # Milieu relatif du seau (gamma^(i-1), gamma^i] : erreur relative bornée
+    values[large] = (
+        EXACT_LENGTHS
+        * 2
+        * GAMMA ** (buckets[large] - EXACT_LENGTHS)
+        / (GAMMA + 1)
+    )
+    return values
+
+
+class LengthSketch:
+    def __init__(self, frame: pd.DataFrame, names: pd.Index) -> None:
+        frame = frame.dropna(subset=["len_content"])
+        self.names = names
+
+        # Un histogramme de longueurs par (jour, membre), fusionnable par addition
+        aggregate = (
+            pd.DataFrame(
+                {
+                    "day": frame_days(frame),
+                    "person": frame["person_id"].to_numpy(),
+                    "bucket": length_buckets(frame["len_content"].to_numpy()),
+                }
+            )
+            .groupby(["day", "person", "bucket"], sort=True)
+            .size()
+            .reset_index(name="count")
+        )
+        self.days = aggregate["day"].to_numpy()
+        self.people = aggregate["person"].to_numpy()
+        self.buckets = aggregate["bucket"].to_numpy()
+        self.counts = aggregate["count"].to_numpy()
+
+    @property
+    def nbytes(self) -> int:
+        return int(
+            self.days.nbytes
+            + self.people.nbytes
+            + self.buckets.nbytes
+            + self.counts.nbytes
+        )
+
+    def _range(self, start_day: int, end_day: int) -> slice:
+        lo = int(np.searchsorted(self.days, start_day, side="left"))
+        hi = int(np.searchsorted(self.days, end_day, side="right"))
+        return slice(lo, hi)
+
+    def medians(
+        self, start_day: int, end_day: int, names: Optional[Iterable[str]] = None
+    ) -> pd.Series:
+        window = self._range(start_day, end_day)
+        people = self.people[window]
+        buckets = self.buckets[window]
+        counts = self.counts[window]
+        if names is not None:
+            codes = self.names.get_indexer(list(names))
+            keep = np.isin(people, codes[codes >= 0])
+            people, buckets, counts = people[keep], buckets[keep], counts[keep]
+        if not len(counts):
+            return pd.Series(dtype="float64")
+        groups, medians = weighted_quantiles(
+            people, bucket_values(buckets), counts, 0.5
+        )
+        return pd.Series(medians, index=self.names[groups])
+
+    def overall_median(self, start_day: int, end_day: int) -> float:
+        window = self._range(start_day, end_day)
+        if window.start == window.stop:
+            return float("nan")
+        _, medians = weighted_quantiles(
+            np.zeros(window.stop - window.start, dtype="int64"),
+            bucket_values(self.buckets[window]),
+            self.counts[window],
+            0.5,
+        )
+        return float(medians[0])
+
+
+def splitmix64(values: np.ndarray) -> np.ndarray:
+    with np.errstate(over="ignore"):
+        z = values.astype("uint64") + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def bit_lengths(values: np.ndarray) -> np.ndarray:
+    values = values.copy()
+    lengths = np.zeros(len(values), dtype="int64")
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= np.uint64(1 << shift)
+        lengths[high] += shift
+        values[high] >>= np.uint64(shift)
+    return lengths + (values > 0)
+
+
+class DistinctCounter:
+    def __init__(self, frame: pd.DataFrame) -> None:
+        pairs = pd.DataFrame(
+            {"day": frame_days(frame), "person_id": frame["person_id"].to_numpy()}
+        ).drop_duplicates()
+        self.days, day_rows = np.unique(pairs["day"].to_numpy(), return_inverse=True)
+        people = pairs["person_id"].to_numpy().astype("int64")
+        width = int(people.max()) + 1 if len(people) else 0
+        self.bits: Optional[np.ndarray] = None
+        self.registers: Optional[np.ndarray] = None
+
+        if width <= EXACT_DISTINCT_LIMIT:
+            # Peu de membres : un bit par membre et par jour, l'union reste exacte
+            self.bits = np.zeros((len(self.days), (width + 7) // 8), dtype="uint8")
+            np.bitwise_or.at(
+                self.bits, (day_rows, people >> 3), (1 << (people & 7)).astype("uint8")
+            )
+            return
+
+        # HyperLogLog par jour : un registre = le plus long préfixe de zéros vu
+        hashes = splitmix64(people)
+        registers = (hashes >> np.uint64(64 - HLL_PRECISION)).astype(np.intp)
+        remainder = (hashes << np.uint64(HLL_PRECISION)) | np.uint64(
+            (1 << HLL_PRECISION) - 1
+        )
+        ranks = 65 - bit_lengths(remainder)
+        self.registers = np.zeros((len(self.days), HLL_REGISTERS), dtype="uint8")
+        np.maximum.at(self.registers, (day_rows, registers), ranks.astype("uint8"))
+
+    @property
+    def nbytes(self) -> int:
+        table = self.bits if self.bits is not None else self.registers
+        return int(self.days.nbytes + table.nbytes)
+
+    def count(self, start_day: int, end_day: int) -> int:
+        lo = int(np.searchsorted(self.days, start_day, side="left"))
+        hi = int(np.searchsorted(self.days, end_day, side="right"))
+        if hi <= lo:
+            return 0
+        if self.bits is not None:
+            return int(np.unpackbits(np.bitwise_or.reduce(self.bits[lo:hi])).sum())
+        merged = self.registers[lo:hi].max(axis=0)
+        m = HLL_REGISTERS
+        harmonic = np.ldexp(1.0, -merged.astype("int64")).sum()
+        estimate = 0.7213 / (1 + 1.079 / m) * m * m / harmonic
+        zeros = int((merged == 0).sum())
+        if estimate <= 2.5 * m and zeros:
+            # Correction des petits effectifs (comptage linéaire)
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
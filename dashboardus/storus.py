@@ -0,0 +1,118 @@
+import logging
+import os
+import threading
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+TEXT_COLUMNS = ["content", "jump_url"]
+TEXT_ROW_GROUP_SIZE = 4096
+
+
+def drop_text_columns(df: pd.DataFrame) -> pd.DataFrame:
+    return df.drop(columns=[col for col in TEXT_COLUMNS if col in df.columns])
+
+
+def write_text_store(df: pd.DataFrame, path: str) -> None:
+    frame = pd.DataFrame({"message_id": df["message_id"].astype("int64")})
+    for col in TEXT_COLUMNS:
+        values = df[col] if col in df.columns else pd.Series(None, index=df.index)
+        frame[col] = values.astype(object).where(values.notna(), None)
+    frame = frame.drop_duplicates("message_id", keep="last")
+    write_text_table(
+        pa.Table.from_pandas(frame, preserve_index=False).cast(
+            pa.schema(
+                [("message_id", pa.int64())]
+                + [(col, pa.string()) for col in TEXT_COLUMNS]
+            )
+        ),
+        path,
+    )
+
+
+def write_text_table(table: pa.Table, path: str) -> None:
+    # Petits groupes triés par id : une lecture ne décompresse que ce qu'elle demande
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(
+        table.sort_by("message_id"),
+        tmp_path,
+        compression="zstd",
+        row_group_size=TEXT_ROW_GROUP_SIZE,
+    )
+    os.replace(tmp_path, path)
+    logging.info(
+        f"Wrote message text store to {path} ({os.path.getsize(path) / 1e6:.1f} MB)."
+    )
+
+
+class MessageTextStore:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._file: Optional[pq.ParquetFile] = None
+        self._signature: Optional[tuple] = None
+        self._mins = np.empty(0, dtype="int64")
+        self._maxs = np.empty(0, dtype="int64")
+        self._lock = threading.Lock()
+
+    def _open(self) -> Optional[pq.ParquetFile]:
+        try:
+            stat = os.stat(self.path)
+            signature = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            signature = (None, None)
+        if signature == self._signature:
+            return self._file
+        self._signature = signature
+        self._file = None
+        if signature[0] is None:
+            logging.warning(f"Message text store {self.path} not found.")
+            return None
+
+        parquet_file = pq.ParquetFile(self.path)
+        metadata = parquet_file.metadata
+        column = parquet_file.schema_arrow.get_field_index("message_id")
+        stats = [
+            metadata.row_group(i).column(column).statistics
+            for i in range(metadata.num_row_groups)
+        ]
+        self._mins = np.array([s.min for s in stats], dtype="int64")
+        self._maxs = np.array([s.max for s in stats], dtype="int64")
+        self._file = parquet_file
+        return parquet_file
+
+    def fetch(self, message_ids: Iterable) -> pd.DataFrame:
+        ids = np.unique(np.asarray(list(message_ids), dtype="int64"))
+        empty = pd.DataFrame(
+            columns=TEXT_COLUMNS, index=pd.Index([], name="message_id")
+        )
+        with self._lock:
+            parquet_file = self._open()
+            if parquet_file is None or not len(ids) or not len(self._maxs):
+                return empty
+
+            groups = np.searchsorted(self._maxs, ids, side="left")
+            found = groups < len(self._maxs)
+            groups = groups[found]
+            groups = np.unique(groups[self._mins[groups] <= ids[found]])
+            if not len(groups):
+                return empty
+            table = parquet_file.read_row_groups(
+                groups.tolist(), columns=["message_id"] + TEXT_COLUMNS
+            )
+
+        frame = table.to_pandas()
+        return frame[frame["message_id"].isin(ids)].set_index("message_id")
+
+
+def with_message_text(
+    frame: pd.DataFrame, text_store: MessageTextStore
+) -> pd.DataFrame:
+    texts = text_store.fetch(frame["message_id"])
+    jump_urls = frame["message_id"].map(texts["jump_url"]).astype(object)
+    return frame.assign(
+        content=frame["message_id"].map(texts["content"]).fillna(""),
+        jump_url=jump_urls.where(jump_urls.notna(), None),
+    )
@@ -2,7 +2,27 @@ DATA_DIR = "dataus"
 CACHE_FILENAME = "discord_messages_cache.parquet"
 SERVER_DATA_FILENAME = "server_data.json"
 STATS_FILENAME = "discord_server_stats.csv"
+SHARED_DATASET_FILENAME = "dashboard_messages.arrow"
+MESSAGE_TEXT_FILENAME = "message_text.parquet"
+BACKGROUND_JOBS_DIRNAME = "background_jobs"
+DATASET_RELOAD_SECONDS = 60
 MIN_MESSAGE_COUNT = 100
+DISCORD_EPOCH_MS = 1420070400000
+SNOWFLAKE_TIMESTAMP_SHIFT = 22
+CACHE_ROW_GROUP_SIZE = 65536
+CACHE_SORT_COLUMNS = ["channel_id", "message_id"]
+CACHE_PLAIN_COLUMNS = ["message_id", "edited_at", "content", "jump_url"]
+
+FILTER_CACHE_MAX_ENTRIES = 24
+FILTER_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_MAX_DISK_ENTRIES = 4096
+TABLE_PAGE_SIZE = 25
+TRACE_POINT_BUDGET = 400
+USER_OPTIONS_SEARCH_THRESHOLD = 300
+DISTRIBUTION_TOP_USERS = 3
+USER_OPTIONS_SEARCH_LIMIT = 50
+TOP_REACTIONS_COUNT = 10
 
 EXCLUDED_CHANNEL_IDS = [
     443310265233309696,
@@ -1,5 +1,6 @@
 import argparse
 import asyncio
+import functools
 import json
 import logging
 import os
@@ -8,17 +9,29 @@ import pandas as pd
 from dotenv import load_dotenv
 
 from corus.botus import run_bot
+from corus.parquetus import CacheCompactor, cache_parts_dir, read_message_cache
+from corus.preparus import prepare_dataframe
+from corus.snowflakus import snowflake_at
+from corus.sqlus import run_query
 from dashboardus.appus import create_app
+from dashboardus.servus import serve, write_shared_dataset
+from dashboardus.storus import (
+    TEXT_COLUMNS,
+    MessageTextStore,
+    drop_text_columns,
+    write_text_store,
+)
 from dataus.constant import (
+    BACKGROUND_JOBS_DIRNAME,
     CACHE_FILENAME,
     DATA_DIR,
+    DATASET_RELOAD_SECONDS,
     EXCLUDED_CHANNEL_IDS,
-    ID_NAME_MAP,
-    IDS_TO_EXCLUDE,
+    MESSAGE_TEXT_FILENAME,
     MIN_MESSAGE_COUNT,
     MUDAE_CHANNELS,
     SERVER_DATA_FILENAME,
-    SMURF_IDS,
+    SHARED_DATASET_FILENAME,
     STATS_FILENAME,
 )
 
@@ -39,7 +52,6 @@ def process_and_save_stats(df: pd.DataFrame, filename: str) -> pd.DataFrame:
     df_copy = df.copy()
     excluded_ids = list(EXCLUDED_CHANNEL_IDS) + list(MUDAE_CHANNELS)
     df_copy = df_copy[~df_copy["channel_id"].isin(excluded_ids)]
-    df_copy["timestamp"] = pd.to_datetime(df_copy["timestamp"])
     df_copy["year"] = df_copy["timestamp"].dt.year
     yearly_counts = (
         df_copy.groupby(["author_name", "year"]).size().unstack(fill_value=0)
@@ -59,66 +71,14 @@ def process_and_save_stats(df: pd.DataFrame, filename: str) -> pd.DataFrame:
     return df
 
 
-def prepare_dataframe(df: pd.DataFrame, server_data: dict) -> pd.DataFrame:
-    if df.empty:
-        logging.warning("DataFrame is empty, skipping preparation.")
-        return df
-
-    df_copy = df.copy()
-
-    author_map = {int(k): v["name"] for k, v in server_data.get("members", {}).items()}
-    
-    for id_str, name in ID_NAME_MAP.items():
-        author_id = int(id_str)
-        if author_id not in author_map:
-            author_map[author_id] = name
-    
-    channel_map = {
-        int(k): v["name"] for k, v in server_data.get("channels", {}).items()
-    }
-
-    df_copy["author_name"] = df_copy["author_id"].map(author_map)
-    df_copy["channel_name"] = df_copy["channel_id"].map(channel_map)
-
-    mask_unknown = df_copy["author_name"].isna()
-    df_copy.loc[mask_unknown, "author_name"] = df_copy.loc[mask_unknown].apply(
-        lambda row: row.get("author_discord_name", f"Ex-membre ({row['author_id']})"),
-        axis=1
-    )
-    df_copy["created_at"] = pd.to_datetime(df_copy["created_at"], utc=True)
-
-    EXCLUDE_LIST = list(IDS_TO_EXCLUDE) + list(SMURF_IDS)
-    df_copy = df_copy[~df_copy["author_id"].isin(EXCLUDE_LIST)]
-
-    active_user_count = len(df_copy["author_name"].unique())
-
-    if "top_reaction_count" in df_copy.columns:
-        df_copy["total_reaction_count"] = df_copy["top_reaction_count"]
-
-    numeric_cols = ["len_content", "total_reaction_count", "attachments", "embeds"]
-    for col in numeric_cols:
-        df_copy[col] = df_copy.get(col, 0).fillna(0).astype(int) if col in df_copy.columns else 0
-
-    list_cols = ["mentions", "mentioned_role_ids", "reactions"]
-    for col in list_cols:
-        if col in df_copy.columns:
-            df_copy[col] = df_copy[col].fillna("[]").apply(
-                lambda x: x if isinstance(x, (list, str)) else "[]"
-            )
-        else:
-            df_copy[col] = "[]"
-
-    optional_cols = ["edited_at", "pinned", "content", "jump_url"]
-    for col in optional_cols:
-        if col not in df_copy.columns:
-            df_copy[col] = pd.NA
-
-    df_copy.rename(columns={"created_at": "timestamp"}, inplace=True)
-
-    logging.info(
-        f"Preparation complete. {len(df_copy)} messages and {active_user_count} active users retained."
+def load_cached_dataset(since=None) -> tuple:
+    with open(os.path.join(DATA_DIR, SERVER_DATA_FILENAME), encoding="utf-8") as f:
+        server_data = json.load(f)
+    # Le texte des messages reste dans le store, seules les colonnes d'analyse sont lues
+    cache_df = read_message_cache(
+        os.path.join(DATA_DIR, CACHE_FILENAME), exclude=TEXT_COLUMNS, since=since
     )
-    return df_copy
+    return drop_text_columns(prepare_dataframe(cache_df, server_data)), server_data
 
 
 async def main():
@@ -141,8 +101,88 @@ async def main():
         default=40,
         help="Sleep after this many messages per channel",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=None,
+        help="Directory used to share rendered dashboard views between sessions and workers",
+    )
+    parser.add_argument(
+        "--background-callbacks",
+        action="store_true",
+        help="Compute dashboard panels in background jobs with progress reporting",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of gunicorn worker processes sharing a memory-mapped copy of the dataset",
+    )
+    parser.add_argument(
+        "--bind",
+        type=str,
+        default="0.0.0.0:8050",
+        help="Address the dashboard server listens on",
+    )
+    parser.add_argument(
+        "--reload-interval",
+        type=float,
+        default=DATASET_RELOAD_SECONDS,
+        help="Seconds between checks for a newer dataset on disk (0 disables hot reload)",
+    )
+    parser.add_argument(
+        "--fetch-only",
+        action="store_true",
+        help="Fetch messages and write the dataset files without launching the dashboard",
+    )
+    parser.add_argument(
+        "--profile-callbacks",
+        action="store_true",
+        help="Sample every dashboard callback and list the profiles on /metrics/profiles",
+    )
+    parser.add_argument(
+        "--approximate-stats",
+        action="store_true",
+        help="Answer median lengths and active member counts from per-day sketches",
+    )
+    parser.add_argument(
+        "--since",
+        type=str,
+        default=None,
+        help="Only show messages sent on or after this date (e.g., --since 2024-01-01)",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Merge the message cache parts, rewrite the cache and the text store, then exit",
+    )
+    parser.add_argument(
+        "--compact-interval",
+        type=float,
+        default=0,
+        help="Seconds between background checks for cache parts to compact (0 disables it)",
+    )
+    parser.add_argument(
+        "--sql",
+        type=str,
+        default=None,
+        help="Run a SQL query over the message cache (tables: messages, members, channels) and exit",
+    )
     args = parser.parse_args()
 
+    cache_path = os.path.join(DATA_DIR, CACHE_FILENAME)
+    text_store_path = os.path.join(DATA_DIR, MESSAGE_TEXT_FILENAME)
+    compactor = CacheCompactor(
+        cache_path, functools.partial(write_text_store, path=text_store_path)
+    )
+    if args.compact:
+        compactor.compact()
+        return
+    if args.sql:
+        server_data_path = os.path.join(DATA_DIR, SERVER_DATA_FILENAME)
+        print(run_query(args.sql, cache_path, server_data_path).to_string(index=False))
+        return
+
     if not DISCORD_TOKEN:
         logging.error("DISCORD_TOKEN is not set! Please check your .env file.")
         return
@@ -172,6 +212,9 @@ async def main():
         EXCLUDED_CHANNEL_IDS,
     )
 
+    if args.since:
+        since_id = snowflake_at(args.since)
+        dashboard_df = dashboard_df[dashboard_df["message_id"] >= since_id]
     if dashboard_df.empty:
         logging.warning("No data was collected. Program will exit.")
         return
@@ -183,9 +226,67 @@ async def main():
 
     process_and_save_stats(processed_df, os.path.join(DATA_DIR, STATS_FILENAME))
 
-    app = create_app(processed_df, server_data, MUDAE_CHANNELS)
-    logging.info("Launching Dash web server on http://localhost:8050/")
-    app.run(host="0.0.0.0", port=8050, debug=False)
+    write_text_store(processed_df, text_store_path)
+    processed_df = drop_text_columns(processed_df)
+    del dashboard_df
+
+    if args.fetch_only or args.workers > 1:
+        write_shared_dataset(
+            processed_df, os.path.join(DATA_DIR, SHARED_DATASET_FILENAME)
+        )
+    if args.fetch_only:
+        if args.compact_interval > 0:
+            logging.warning(
+                "--compact-interval is ignored with --fetch-only, "
+                "the fetch already compacted the cache."
+            )
+        logging.info("Dataset files updated, running dashboards will reload them.")
+        return
+
+    # Un seul compacteur, dans le processus maître : le verrou écarte les autres
+    compactor.start(args.compact_interval)
+    if args.workers > 1:
+        logging.info(
+            f"Launching {args.workers} dashboard workers on http://{args.bind}/"
+        )
+        serve(
+            args.workers,
+            args.bind,
+            data_dir=DATA_DIR,
+            result_cache_dir=args.cache_dir,
+            background_callbacks=args.background_callbacks,
+            profile_callbacks=args.profile_callbacks,
+            reload_interval=args.reload_interval,
+            approximate_stats=args.approximate_stats,
+        )
+        return
+
+    background_jobs_dir = (
+        os.path.join(DATA_DIR, BACKGROUND_JOBS_DIRNAME)
+        if args.background_callbacks
+        else None
+    )
+    app = create_app(
+        processed_df,
+        server_data,
+        MUDAE_CHANNELS,
+        args.cache_dir,
+        background_jobs_dir,
+        args.profile_callbacks,
+        functools.partial(load_cached_dataset, args.since),
+        [
+            cache_path,
+            cache_parts_dir(cache_path),
+            os.path.join(DATA_DIR, SERVER_DATA_FILENAME),
+        ],
+        args.reload_interval,
+        MessageTextStore(text_store_path),
+        args.approximate_stats,
+        os.path.join(DATA_DIR, SERVER_DATA_FILENAME),
+    )
+    host, _, port = args.bind.rpartition(":")
+    logging.info(f"Launching Dash web server on http://{args.bind}/")
+    app.run(host=host, port=int(port), debug=False)
 
 
 if __name__ == "__main__":